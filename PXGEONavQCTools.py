@@ -24,6 +24,7 @@ import sys
 import os
 import re
 import logging
+import multiprocessing
 import shutil
 import time
 import datetime
@@ -1061,6 +1062,8 @@ class MainWindow(QMainWindow):
 # Main Execution
 # -----------------------------------------------------------------------------
 if __name__ == "__main__":
+    # Required for process pools (LineLogManager.extract_many) in frozen builds
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -11,15 +11,225 @@ Author: aldien03@gmail.com
 Date: 2025-09-30
 """
 
+import io
 import os
+import random
 import re
+import shutil
+import sys
 import time
 import logging
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, compress
+from operator import itemgetter
+import numpy as np
 import pandas as pd
 import openpyxl
-from typing import Dict, List, Optional, Tuple
-from configparser import ConfigParser
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from configparser import ConfigParser, InterpolationError
 from openpyxl.styles import Alignment
+from openpyxl.utils import column_index_from_string, coordinate_to_tuple, get_column_letter
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # optional Rust-backed reader (pip install python-calamine)
+    CalamineWorkbook = None
+
+
+# Shot point marker keywords, matched case-insensitively anywhere in a cell.
+# Only one marker per cell counts: the first in _MARKER_NAMES order, not in the text.
+_MARKER_RE = re.compile(r'FASP|FGSP|LGSP|LSP|FOSP|LOSP', re.IGNORECASE)
+
+# Marker keys in line log order, used to seed the extraction result. Interned so
+# keys built from cell text (see _scan_sheet) are the same objects as the literals.
+_MARKER_NAMES = tuple(sys.intern(name) for name in ('FASP', 'FGSP', 'LGSP', 'LSP', 'FOSP', 'LOSP'))
+
+# Priority of each marker when a cell names several (lower wins)
+_MARKER_RANK = {name: i for i, name in enumerate(_MARKER_NAMES)}
+
+# One bit per marker, for presence masks
+_MARKER_BITS = {name: 1 << i for i, name in enumerate(_MARKER_NAMES)}
+_OVERLAP_MASK = _MARKER_BITS['FOSP'] | _MARKER_BITS['LOSP']
+
+# Calculated shot point counts: field -> (first marker, last marker, required SP mask)
+_SHOT_COUNTS = {
+    'production_sp': ('FGSP', 'LGSP', _MARKER_BITS['FGSP'] | _MARKER_BITS['LGSP']),
+    'overlap_sp': ('FOSP', 'LOSP', _OVERLAP_MASK),
+}
+
+# Human-readable line log labels for log_data keys
+_LABELS: Dict[str, str] = {
+    # Original QC checks
+    'log_sub_array_sep_flag': "SP with Sub-Array Sep <6.8m or >9.2m",
+    'log_gun_depth_flag': "SP with Gun Depth <6m or >8m",
+    'log_volume_flag': "SP with Volume <3040 cui",
+    'log_timing_warning': "SP with Gun Timing >1.0ms and <=1.5ms",
+    'log_timing_error': "SP with Gun Timing >1.5ms",
+    'log_gun_pressure_flag': "SP with Pressure <1900psi or >2100psi",
+    'log_sma_flag': "SP with SMA >3",
+    'log_gun_disabled_flag': "SP with Gun Disabled",
+    'log_misfire_flag': "SP with suspected misfire",
+    'log_autofires': "SP with suspected autofire",
+    'log_repeatability_flag': "SP with Radial >10.0m",
+
+    # Enhanced QC checks (Phase 4.3)
+    'log_sub_array_sep_percent_violation': "Sub-Array Separation Percentage Violation",
+    'log_sub_array_sep_avg_violation': "Sub-Array Separation Sequence Average Violation",
+    'log_gun_depth_sensor_violation': "Gun Depth Sensor Violations",
+    'log_consec_7_source_errors': "7+ Consecutive SP with Source Errors",
+    'log_window_12_of_24_source_errors': "12+ Source Errors in 24 SP Window",
+    'log_window_16_of_40_source_errors': "16+ Source Errors in 40 SP Window",
+    'log_percent_3_total_source_errors': "Source Errors Exceed 3% of Total SP",
+}
+
+# Shot point range inside a log entry, e.g. '1001-1005' or 'Sensor 1: 1001 - 1005'
+_RANGE_RE = re.compile(r'(?P<prefix>.*?)(?P<lo>\d+)\s*-\s*(?P<hi>\d+)')
+
+# log_data keys holding source error range strings ('1001-1005')
+_SOURCE_ERROR_RANGE_KEYS = frozenset({
+    'log_consec_7_source_errors', 'log_window_12_of_24_source_errors',
+    'log_window_16_of_40_source_errors',
+})
+
+# log_data keys holding (sp, [guns]) tuples
+_GUN_KEYS = frozenset({
+    'log_timing_warning', 'log_timing_error', 'log_gun_disabled_flag', 'log_misfire_flag',
+})
+
+# log_data keys left out of the line log comments
+_EXCLUDED_KEYS = frozenset({'log_gun_timing_flag'})
+
+# log_data keys holding preformatted message strings
+_MESSAGE_KEYS = frozenset({
+    'log_sub_array_sep_percent_violation', 'log_sub_array_sep_avg_violation',
+    'log_percent_3_total_source_errors',
+})
+
+# Line metadata fields: field -> (config key, default cell, value type)
+_METADATA_CELLS = {
+    'filename': ('cell_filename', 'C6', str),
+    'line': ('cell_line', 'C7', str),
+    'sequence': ('cell_sequence', 'C8', int),
+    'attempt': ('cell_attempt', 'C9', int),
+    'heading': ('cell_heading', 'E8', float),
+}
+
+# Marks an exhausted iterator in _nonempty()
+_SENTINEL = object()
+
+# Supported readers for read-only line log extraction
+_BACKENDS = ('openpyxl', 'calamine')
+
+# Maximum number of parsed read-only workbooks kept by LineLogManager
+_WORKBOOK_CACHE_SIZE = 8
+
+# English month abbreviations for DD-Mon-YY line log dates (locale independent)
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+           'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def _shot_count(first_sp: int, last_sp: int, shot_increment: int) -> int:
+    """Number of shot points from first_sp to last_sp inclusive (either direction)."""
+    return abs(last_sp - first_sp) // shot_increment + 1
+
+
+def _clean_str(value) -> str:
+    """Convert a cell value to str, stripping only when it has edge whitespace."""
+    text = value if type(value) is str else str(value)
+    if text and (text[0].isspace() or text[-1].isspace()):
+        return text.strip()
+    return text
+
+
+def _nonempty(items: Iterator) -> Optional[Iterator]:
+    """Peek at an iterator: None if it is exhausted, else an equivalent iterator."""
+    first = next(items, _SENTINEL)
+    if first is _SENTINEL:
+        return None
+    return chain((first,), items)
+
+
+def _copy_line_info(info: Dict) -> Dict:
+    """
+    Copy an extract_line_info() result down to its section dicts.
+
+    The per-marker entry dicts are shared with the memo and must be treated
+    as read-only; the sections themselves can be edited freely.
+    """
+    return {section: dict(values) for section, values in info.items()}
+
+
+def _marker_sp(markers: Dict, name: str) -> Optional[int]:
+    """Shot point of a marker from extract_shot_point_markers(), or None if absent."""
+    marker = markers.get(name)
+    return marker['sp'] if marker else None
+
+
+def _as_sp_array(shot_points: Union[np.ndarray, Sequence[int]]) -> np.ndarray:
+    """
+    Normalize a shot point sequence to a packed int32 array.
+
+    Lists, arrays and other iterables take the same path, so float input
+    (e.g. from a float shot_point column) gives the same result either way.
+    NaN entries are dropped; int32 arrays are returned without a copy.
+
+    Args:
+        shot_points: ndarray or sequence of shot point numbers
+
+    Returns:
+        Shot points as an int32 np.ndarray
+    """
+    if not isinstance(shot_points, (np.ndarray, Sequence)):
+        shot_points = list(shot_points)
+    points = np.asarray(shot_points)
+    if points.dtype.kind == 'f':
+        points = points[~np.isnan(points)]
+    return points.astype(np.int32, copy=False)
+
+
+def _calamine_value(value):
+    """Map a python-calamine cell value onto what openpyxl returns for it."""
+    if value == '':
+        return None
+    if type(value) is float and value.is_integer():
+        return int(value)
+    return value
+
+
+class _CalamineSheet:
+    """Read-only worksheet facade over a python-calamine sheet, for _scan_sheet()."""
+
+    def __init__(self, sheet):
+        self._sheet = sheet
+        self.title = sheet.name
+
+    def iter_rows(self, min_row: int = 1, max_row: int = None, min_col: int = 1,
+                  max_col: int = None, values_only: bool = True):
+        """Yield padded value tuples like openpyxl's iter_rows(values_only=True)."""
+        rows = self._sheet.to_python(skip_empty_area=False, nrows=max_row)
+        max_row = max_row or len(rows)
+        max_col = max_col or max((len(row) for row in rows), default=min_col)
+        width = max_col - min_col + 1
+
+        for row_num in range(min_row, max_row + 1):
+            row = rows[row_num - 1] if row_num <= len(rows) else ()
+            values = tuple(_calamine_value(v) for v in row[min_col - 1:max_col])
+            yield values + (None,) * (width - len(values))
+
+
+class _CalamineBook:
+    """Read-only workbook facade over python-calamine (first sheet is 'active')."""
+
+    def __init__(self, source):
+        book = CalamineWorkbook.from_filelike(source)
+        self.active = _CalamineSheet(book.get_sheet_by_index(0))
+
+    def close(self) -> None:
+        """Nothing to release: the workbook was read from memory."""
 
 
 class LineLogManager:
@@ -33,20 +243,64 @@ class LineLogManager:
     - Formatting and inserting QC comments
     - Handling percentages, missing SP, and log data
     - Saving workbooks with proper error handling
+    - Batching several edits per file into one save (queue_update/flush)
+
+    Shot point entries in log_data (e.g. 'log_sub_array_sep_flag',
+    'log_repeatability_flag') may be plain lists of ints or np.ndarray[int32]
+    as produced by QCValidator.generate_line_log_report.
     """
 
-    def __init__(self, config: ConfigParser):
+    def __init__(self, config: ConfigParser, backend: str = 'openpyxl'):
         """
         Initialize LineLogManager with configuration.
 
         Args:
             config: ConfigParser instance containing line log settings
+            backend: Reader for read-only extraction, 'openpyxl' or 'calamine'
+                     (python-calamine, falls back to openpyxl when not installed).
+                     Line log updates always use openpyxl.
+
+        Raises:
+            ValueError: If backend is not a supported reader
         """
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unsupported line log backend: {backend!r} (expected one of {_BACKENDS})")
+        if backend == 'calamine' and CalamineWorkbook is None:
+            logging.warning("python-calamine is not installed, using openpyxl to read line logs")
+            backend = 'openpyxl'
+
         self.config = config
+        self.backend = backend
         self.line_log_pattern = r'0256-\d{4}[A-Z]\d\d{4}_Nav_LineLog\.xlsm$'
         self.max_attempts = config.getint('LineLog', 'max_open_attempts', fallback=5)
+        # Locked-file retry: exponential backoff with jitter, bounded by a total deadline
+        self.retry_base_delay = config.getfloat('LineLog', 'retry_base_delay', fallback=0.5)
+        self.retry_max_delay = config.getfloat('LineLog', 'retry_max_delay', fallback=8.0)
+        self.open_timeout = config.getfloat('LineLog', 'open_timeout', fallback=30.0)
         self.comments_label = config.get('LineLog', 'acquisition_comments_label',
                                         fallback='Acquisition and Processing Comments')
+        # Raw read: a literal '%' in a Windows path must not break interpolation
+        self.template_path = config.get('LineLog', 'line_log_template', raw=True,
+                                        fallback='').strip() or None
+        # [LineLog] options resolved once, so cell lookups skip ConfigParser interpolation
+        self._cell_refs: Dict[str, str] = {}
+        if config.has_section('LineLog'):
+            for key in config.options('LineLog'):
+                try:
+                    self._cell_refs[key] = config.get('LineLog', key)
+                except InterpolationError:
+                    # Not a cell reference (e.g. a path with a stray '%'); keep it verbatim
+                    self._cell_refs[key] = config.get('LineLog', key, raw=True)
+        # Last row where the comments label was found, keyed by sheet title
+        self._comments_row_cache: Dict[str, int] = {}
+        # Workbook edits awaiting flush(), keyed by file path
+        self._pending: Dict[str, List[Callable[[openpyxl.Workbook], bool]]] = {}
+        # Parsed read-only workbooks (LRU), keyed by (absolute path, mtime_ns, size)
+        self._workbook_cache: 'OrderedDict[Tuple[str, int, int], openpyxl.Workbook]' = OrderedDict()
+        # {cell_ref: value} snapshots of streamed (read-only) sheets for _get_cell_value
+        self._sheet_values: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+        # extract_line_info() results, keyed by absolute path -> ((mtime_ns, size), result)
+        self._line_info_cache: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
 
     def find_line_log_file(self, directory: str) -> Optional[str]:
         """
@@ -73,26 +327,53 @@ class LineLogManager:
         logging.debug(f"Line Log path: {line_log_path}")
         return line_log_path
 
-    def open_workbook_with_retry(self, file_path: str) -> Optional[openpyxl.Workbook]:
+    def open_workbook_with_retry(self, file_path: str,
+                                 read_only: bool = False) -> Optional[openpyxl.Workbook]:
         """
         Open workbook with retry logic for locked files.
 
+        A PermissionError (file locked, e.g. open in Excel) is retried with
+        exponential backoff plus jitter, up to max_attempts tries and at most
+        open_timeout seconds in total. Other errors fail immediately.
+
         Args:
             file_path: Path to Excel file
+            read_only: Open in streaming read-only mode (cached values, no VBA/links).
+                       Read-only worksheets must be read with iter_rows(). The file
+                       is read into memory so no handle is kept on the line log.
+                       With the 'calamine' backend a python-calamine facade exposing
+                       .active.iter_rows() is returned instead.
 
         Returns:
             Opened workbook, or None if failed
         """
+        if read_only:
+            load_kwargs = {'read_only': True, 'data_only': True, 'keep_links': False}
+        else:
+            load_kwargs = {'keep_vba': True}
+
         wb = None
+        deadline = time.monotonic() + self.open_timeout
         for attempt in range(self.max_attempts):
             try:
-                wb = openpyxl.load_workbook(file_path, keep_vba=True)
+                source = file_path
+                if read_only:
+                    with open(file_path, 'rb') as f:
+                        source = io.BytesIO(f.read())
+                if read_only and self.backend == 'calamine':
+                    wb = _CalamineBook(source)
+                else:
+                    wb = openpyxl.load_workbook(source, **load_kwargs)
                 logging.debug(f"Successfully opened Line Log file on attempt {attempt + 1}")
                 break
             except PermissionError:
-                if attempt < self.max_attempts - 1:
-                    logging.warning(f"Line Log file is locked, attempt {attempt + 1} of {self.max_attempts}")
-                    time.sleep(2)
+                remaining = deadline - time.monotonic()
+                if attempt < self.max_attempts - 1 and remaining > 0:
+                    delay = self.retry_base_delay * (2 ** attempt) + random.uniform(0, self.retry_base_delay)
+                    delay = min(delay, self.retry_max_delay, remaining)
+                    logging.warning(f"Line Log file is locked, attempt {attempt + 1} of {self.max_attempts}, "
+                                    f"retrying in {delay:.1f}s")
+                    time.sleep(delay)
                 else:
                     logging.error("Unable to open Line Log file after multiple attempts")
                     return None
@@ -102,16 +383,170 @@ class LineLogManager:
 
         return wb
 
+    def _load_readonly(self, file_path: str) -> Optional[openpyxl.Workbook]:
+        """
+        Get a read-only workbook, reusing a cached parse while the file is unchanged.
+
+        Entries are keyed by (absolute path, mtime_ns, size), so a re-saved
+        file is parsed again even where mtime resolution is coarse. The returned workbook is owned by the cache: callers must
+        not close it.
+
+        Args:
+            file_path: Path to Excel file
+
+        Returns:
+            Read-only workbook, or None if it could not be opened
+        """
+        try:
+            stat = os.stat(file_path)
+            key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            logging.error(f"Failed to open Line Log: {str(e)}")
+            return None
+
+        wb = self._workbook_cache.get(key)
+        if wb is not None:
+            self._workbook_cache.move_to_end(key)
+            return wb
+
+        wb = self.open_workbook_with_retry(file_path, read_only=True)
+        if not wb:
+            return None
+
+        self._workbook_cache[key] = wb
+        if len(self._workbook_cache) > _WORKBOOK_CACHE_SIZE:
+            _, evicted = self._workbook_cache.popitem(last=False)
+            evicted.close()
+        return wb
+
+    def clear_workbook_cache(self) -> None:
+        """Close and drop all cached read-only workbooks."""
+        for wb in self._workbook_cache.values():
+            wb.close()
+        self._workbook_cache.clear()
+
+    def queue_update(self, file_path: str,
+                     update_fn: Callable[[openpyxl.Workbook], bool]) -> None:
+        """
+        Queue an in-place workbook edit to be applied on the next flush().
+
+        Edits queued for the same file share a single open and save.
+
+        Args:
+            file_path: Path to line log .xlsm file
+            update_fn: Callable that mutates the opened workbook and returns
+                       True on success (False aborts the save for that file)
+        """
+        self._pending.setdefault(file_path, []).append(update_fn)
+
+    def flush(self) -> bool:
+        """
+        Apply all queued edits, opening and saving each workbook once.
+
+        Returns:
+            True if every queued file was updated and saved, False otherwise
+        """
+        pending, self._pending = self._pending, {}
+        all_ok = True
+
+        # Never serve a pre-save parse of a file being written back
+        self.clear_workbook_cache()
+
+        for file_path, update_fns in pending.items():
+            wb = self.open_workbook_with_retry(file_path)
+            if not wb:
+                all_ok = False
+                continue
+
+            try:
+                if not all(update_fn(wb) for update_fn in update_fns):
+                    all_ok = False
+                    continue
+
+                # Save the workbook
+                try:
+                    wb.save(file_path)
+                    self._line_info_cache.pop(os.path.abspath(file_path), None)
+                    logging.debug("Successfully saved Line Log")
+                except PermissionError:
+                    logging.error("PermissionError when saving Line Log")
+                    all_ok = False
+                except Exception as e:
+                    logging.error(f"Failed to save Line Log: {str(e)}")
+                    all_ok = False
+
+            except Exception as e:
+                logging.error(f"Unexpected error in update_line_log: {str(e)}")
+                all_ok = False
+            finally:
+                wb.close()
+                logging.debug("Closed Line Log workbook")
+
+        return all_ok
+
+    def update_workbook(self, wb: openpyxl.Workbook, merged_df: pd.DataFrame,
+                        log_data: Dict, missed_sp: List, percentages: Dict,
+                        consecutive_errors: List,
+                        fgsp: int = None, lgsp: int = None,
+                        fosp: int = None, losp: int = None) -> bool:
+        """
+        Write the date and QC comments into an already-open workbook (no I/O).
+
+        Args:
+            wb: Workbook to modify in place (its active sheet is updated)
+            merged_df: Merged DataFrame containing QC results
+            log_data: Dictionary of log data from QC validation
+            missed_sp: List of missing shot points
+            percentages: Dictionary of QC error percentages
+            consecutive_errors: List of consecutive error ranges
+            fgsp: First Good Shot Point (optional, for filtering)
+            lgsp: Last Good Shot Point (optional, for filtering)
+            fosp: First Overlap Shot Point (optional, for overlap comment)
+            losp: Last Overlap Shot Point (optional, for overlap comment)
+
+        Returns:
+            True if the comments cell was found and updated, False otherwise
+        """
+        sheet = wb.active
+        logging.debug("Updating Line Log content")
+
+        # Update date in cell E6 if datetime_UTC exists
+        if 'datetime_UTC' in merged_df.columns and not merged_df.empty:
+            first_dt = merged_df['datetime_UTC'].iloc[0]
+            first_date = f"{first_dt.day:02d}-{_MONTHS[first_dt.month - 1]}-{first_dt.year % 100:02d}"
+            logging.debug(f"Updating date in E6 to: {first_date}")
+            sheet['E6'].value = first_date
+
+        # Generate content (with production shot filtering if markers provided)
+        content = self._generate_content(merged_df, percentages, log_data, missed_sp,
+                                        consecutive_errors, fgsp, lgsp, fosp, losp)
+
+        # Find and update target cell
+        target_cell = self._find_comments_cell(sheet)
+        if not target_cell:
+            logging.error(f"Could not find '{self.comments_label}' in the Line Log")
+            return False
+
+        target_cell.value = content
+        target_cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+        return True
+
     def update_line_log(self, file_path: str, merged_df: pd.DataFrame,
                        log_data: Dict, missed_sp: List, percentages: Dict,
                        consecutive_errors: List,
                        fgsp: int = None, lgsp: int = None,
-                       fosp: int = None, losp: int = None) -> bool:
+                       fosp: int = None, losp: int = None,
+                       template_path: str = None) -> bool:
         """
         Update line log file with QC data.
 
         Filters log data to production shots only (FGSP to LGSP) and adds
-        overlap comment if applicable.
+        overlap comment if applicable. Queues update_workbook() for the file and
+        flushes immediately; use queue_update()/flush() directly to batch several
+        edits per save.
+
+        If file_path does not exist yet, it is first created as a byte copy of the
+        line log template, so only the date and comments cells are written by openpyxl.
 
         Args:
             file_path: Path to line log .xlsm file
@@ -124,57 +559,27 @@ class LineLogManager:
             lgsp: Last Good Shot Point (optional, for filtering)
             fosp: First Overlap Shot Point (optional, for overlap comment)
             losp: Last Overlap Shot Point (optional, for overlap comment)
+            template_path: Template copied to file_path when it is missing
+                           (default from config 'line_log_template')
 
         Returns:
             True if successful, False otherwise
         """
-        wb = self.open_workbook_with_retry(file_path)
-        if not wb:
-            return False
-
-        sheet = wb.active
-
-        try:
-            logging.debug("Updating Line Log content")
-
-            # Update date in cell E6 if datetime_UTC exists
-            if 'datetime_UTC' in merged_df.columns and not merged_df.empty:
-                first_date = merged_df['datetime_UTC'].iloc[0].strftime('%d-%b-%y')
-                logging.debug(f"Updating date in E6 to: {first_date}")
-                sheet['E6'].value = first_date
-
-            # Generate content (with production shot filtering if markers provided)
-            content = self._generate_content(merged_df, percentages, log_data, missed_sp,
-                                            consecutive_errors, fgsp, lgsp, fosp, losp)
-
-            # Find and update target cell
-            target_cell = self._find_comments_cell(sheet)
-            if target_cell:
-                target_cell.value = content
-                target_cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            else:
-                logging.error(f"Could not find '{self.comments_label}' in the Line Log")
-                return False
-
-            # Save the workbook
+        template_path = template_path or self.template_path
+        if template_path and not os.path.exists(file_path):
             try:
-                wb.save(file_path)
-                logging.debug("Successfully saved Line Log")
-                return True
-            except PermissionError:
-                logging.error("PermissionError when saving Line Log")
-                return False
-            except Exception as e:
-                logging.error(f"Failed to save Line Log: {str(e)}")
+                shutil.copyfile(template_path, file_path)
+                logging.info(f"Created Line Log from template: {template_path}")
+            except OSError as e:
+                logging.error(f"Failed to copy Line Log template: {str(e)}")
                 return False
 
-        except Exception as e:
-            logging.error(f"Unexpected error in update_line_log: {str(e)}")
-            return False
-        finally:
-            if wb:
-                wb.close()
-                logging.debug("Closed Line Log workbook")
+        self.queue_update(file_path, partial(self.update_workbook, merged_df=merged_df,
+                                             log_data=log_data, missed_sp=missed_sp,
+                                             percentages=percentages,
+                                             consecutive_errors=consecutive_errors,
+                                             fgsp=fgsp, lgsp=lgsp, fosp=fosp, losp=losp))
+        return self.flush()
 
     def _filter_log_data_by_range(self, log_data: Dict, fgsp: int, lgsp: int) -> Dict:
         """
@@ -198,54 +603,83 @@ class LineLogManager:
         if not log_data or fgsp is None or lgsp is None:
             return log_data
 
-        filtered_data = {}
+        return {key: list(value) if isinstance(value, Iterator) else value
+                for key, value in self._iter_filtered_log_data(log_data, fgsp, lgsp)}
+
+    def _iter_filtered_log_data(self, log_data: Dict, fgsp: Optional[int],
+                                lgsp: Optional[int]) -> Iterable[Tuple[str, object]]:
+        """
+        Lazily yield the non-empty (key, value) entries of log data within FGSP to LGSP.
+
+        Streaming counterpart of _filter_log_data_by_range(): filtered shot point
+        and (sp, [guns]) lists are yielded as single-use iterators instead of new
+        lists, so _generate_content() can format them without an intermediate copy.
+        Without both markers, every non-empty entry is yielded unchanged.
+
+        Args:
+            log_data: Dictionary of log data with shot points
+            fgsp: First Good Shot Point (optional)
+            lgsp: Last Good Shot Point (optional)
+
+        Yields:
+            (key, value) pairs whose value holds at least one entry
+        """
+        if fgsp is None or lgsp is None:
+            for key, value in log_data.items():
+                if value is not None and len(value):
+                    yield key, value
+            return
+
         min_sp = min(fgsp, lgsp)
         max_sp = max(fgsp, lgsp)
 
         for key, value in log_data.items():
-            if not value:
+            if value is None or len(value) == 0:
+                continue
+
+            # Packed shot point arrays (np.ndarray[int32])
+            if isinstance(value, np.ndarray):
+                filtered_array = value[(value >= min_sp) & (value <= max_sp)]
+                if filtered_array.size:
+                    yield key, filtered_array
                 continue
 
             # String messages - keep as is
             if isinstance(value, str):
-                filtered_data[key] = value
+                yield key, value
                 continue
 
             # List of tuples (sp, [guns])
-            if isinstance(value, list) and value and isinstance(value[0], tuple):
-                filtered_list = [(sp, guns) for sp, guns in value
-                               if min_sp <= sp <= max_sp]
-                if filtered_list:
-                    filtered_data[key] = filtered_list
+            if isinstance(value, list) and isinstance(value[0], tuple):
+                sps = np.fromiter(map(itemgetter(0), value), dtype=np.float64, count=len(value))
+                filtered_iter = _nonempty(compress(value, (sps >= min_sp) & (sps <= max_sp)))
+                if filtered_iter is not None:
+                    yield key, filtered_iter
 
             # List of range strings like ['1001-1005', '1010-1020']
-            elif key in ['log_consec_7_source_errors', 'log_window_12_of_24_source_errors',
-                        'log_window_16_of_40_source_errors', 'log_gun_depth_sensor_violation']:
+            elif key in _SOURCE_ERROR_RANGE_KEYS or key == 'log_gun_depth_sensor_violation':
                 # Parse ranges, filter, and reconstruct
                 filtered_ranges = []
                 for item in value:
-                    if '-' in str(item):
-                        # Parse range string
-                        parts = str(item).split('-')
-                        if len(parts) == 2:
-                            try:
-                                range_start = int(parts[0].strip().split()[-1])  # Handle "Sensor 1: 1001"
-                                range_end = int(parts[1].strip().split()[0])     # Handle "1005 more text"
-
-                                # Check if range overlaps with production range
-                                if range_end >= min_sp and range_start <= max_sp:
-                                    # Trim range to production bounds
-                                    trimmed_start = max(range_start, min_sp)
-                                    trimmed_end = min(range_end, max_sp)
-
-                                    # Reconstruct range string with original prefix (e.g., "Sensor 1: ")
-                                    prefix = item.split(str(range_start))[0] if str(range_start) in item else ""
-                                    filtered_ranges.append(f"{prefix}{trimmed_start}-{trimmed_end}")
-                            except (ValueError, IndexError):
-                                # Keep unparseable items as-is
-                                filtered_ranges.append(item)
-                        else:
+                    item_str = str(item)
+                    if '-' in item_str:
+                        # Parse range string (handles "Sensor 1: 1001-1005")
+                        match = _RANGE_RE.match(item_str) if item_str.count('-') == 1 else None
+                        if match is None:
+                            # Keep unparseable items as-is
                             filtered_ranges.append(item)
+                            continue
+
+                        range_start, range_end = int(match['lo']), int(match['hi'])
+
+                        # Check if range overlaps with production range
+                        if range_end >= min_sp and range_start <= max_sp:
+                            # Trim range to production bounds
+                            trimmed_start = max(range_start, min_sp)
+                            trimmed_end = min(range_end, max_sp)
+
+                            # Reconstruct range string with original prefix (e.g., "Sensor 1: ")
+                            filtered_ranges.append(f"{match['prefix']}{trimmed_start}-{trimmed_end}")
                     else:
                         # Single SP
                         try:
@@ -256,19 +690,18 @@ class LineLogManager:
                             filtered_ranges.append(item)
 
                 if filtered_ranges:
-                    filtered_data[key] = filtered_ranges
+                    yield key, filtered_ranges
 
             # Simple list of shot points
             elif isinstance(value, list):
-                filtered_list = [sp for sp in value if min_sp <= sp <= max_sp]
-                if filtered_list:
-                    filtered_data[key] = filtered_list
+                sps = np.fromiter(value, dtype=np.float64, count=len(value))
+                filtered_iter = _nonempty(compress(value, (sps >= min_sp) & (sps <= max_sp)))
+                if filtered_iter is not None:
+                    yield key, filtered_iter
 
             else:
                 # Unknown type, keep as is
-                filtered_data[key] = value
-
-        return filtered_data
+                yield key, value
 
     def _generate_content(self, merged_df: pd.DataFrame, percentages: Dict,
                          log_data: Dict, missed_sp: List, consecutive_errors: List,
@@ -294,14 +727,12 @@ class LineLogManager:
         Returns:
             Formatted content string with production shots only and overlap info
         """
-        content = f"""Shooting Mode: 4D Source
-Percentage of shotpoints with center of source at or within 10m radial distance from preplot = {100 - percentages.get('percent_radial', 0):.2f}%
-Percentage of shotpoints with Average depth of active source array at or within 1m from nominal 7m depth = {100 - percentages.get('percent_gd_errors', 0):.2f}%"""
-
-        # Filter log data to production shots only (FGSP to LGSP)
-        if fgsp is not None and lgsp is not None:
-            log_data = self._filter_log_data_by_range(log_data, fgsp, lgsp)
-            logging.info("Filtered log_data to production range FGSP=%s to LGSP=%s", fgsp, lgsp)
+        # Content lines, joined once at the end
+        parts: List[str] = [
+            "Shooting Mode: 4D Source",
+            f"Percentage of shotpoints with center of source at or within 10m radial distance from preplot = {100 - percentages.get('percent_radial', 0):.2f}%",
+            f"Percentage of shotpoints with Average depth of active source array at or within 1m from nominal 7m depth = {100 - percentages.get('percent_gd_errors', 0):.2f}%",
+        ]
 
         logging.info("log_autofires in log_data: %s", log_data.get('log_autofires', []))
 
@@ -309,56 +740,56 @@ Percentage of shotpoints with Average depth of active source array at or within
         additional_info = []
         logging.info("log_data: %s", log_data)
 
-        if missed_sp:
-            additional_info.append(f"Missing SP: {', '.join(map(str, missed_sp))}")
+        # Stream log data filtered to production shots only (FGSP to LGSP)
+        log_entries = self._iter_filtered_log_data(log_data, fgsp, lgsp)
+        if fgsp is not None and lgsp is not None:
+            logging.info("Filtering log_data to production range FGSP=%s to LGSP=%s", fgsp, lgsp)
 
-        # List of keys to exclude from the output
-        excluded_keys = ['log_gun_timing_flag']
+        if missed_sp is not None and len(missed_sp):
+            additional_info.append(f"Missing SP: {', '.join(map(str, missed_sp))}")
 
-        for key, value in log_data.items():
+        for key, value in log_entries:
             # Skip excluded keys
-            if key in excluded_keys:
+            if key in _EXCLUDED_KEYS:
                 continue
 
-            if value:
-                label = self._get_label_for_key(key)
-
-                # Format based on value type
-                if key in ['log_timing_warning','log_timing_error','log_gun_disabled_flag','log_misfire_flag']:
-                    # Gun-specific entries with tuple format (sp, [guns])
-                    formatted_values = [f"{sp} ({','.join(guns)})" for sp, guns in value]
-                    additional_info.append(f"{label}: {', '.join(formatted_values)}")
-                elif key == 'log_repeatability_flag':
-                    # Use range detection for repeatability flag
-                    range_summary = self.detect_range(value)
-                    additional_info.append(f"{label}: {range_summary}")
-                elif key in ['log_sub_array_sep_percent_violation', 'log_sub_array_sep_avg_violation',
-                            'log_percent_3_total_source_errors']:
-                    # String messages (no further formatting needed)
-                    additional_info.append(f"{label}: {value}")
-                elif key == 'log_gun_depth_sensor_violation':
-                    # List of sensor warning strings
-                    additional_info.append(f"{label}: {', '.join(value)}")
-                elif key in ['log_consec_7_source_errors', 'log_window_12_of_24_source_errors',
-                            'log_window_16_of_40_source_errors']:
-                    # List of range strings already formatted
-                    additional_info.append(f"{label}: {', '.join(value)}")
-                else:
-                    # Default: list of shot points
-                    formatted_values = map(str, value)
-                    additional_info.append(f"{label}: {', '.join(formatted_values)}")
+            label = self._get_label_for_key(key)
+
+            # Format based on value type
+            if key in _GUN_KEYS:
+                # Gun-specific entries with tuple format (sp, [guns])
+                formatted_values = ', '.join([f"{sp} ({','.join(guns)})" for sp, guns in value])
+                additional_info.append(f"{label}: {formatted_values}")
+            elif key == 'log_repeatability_flag':
+                # Use range detection for repeatability flag
+                range_summary = self.detect_range(_as_sp_array(value))
+                additional_info.append(f"{label}: {range_summary}")
+            elif key in _MESSAGE_KEYS:
+                # String messages (no further formatting needed)
+                additional_info.append(f"{label}: {value}")
+            elif key == 'log_gun_depth_sensor_violation':
+                # List of sensor warning strings
+                additional_info.append(f"{label}: {', '.join(value)}")
+            elif key in _SOURCE_ERROR_RANGE_KEYS:
+                # List of range strings already formatted
+                additional_info.append(f"{label}: {', '.join(value)}")
+            else:
+                # Default: list or int32 array of shot points
+                if isinstance(value, np.ndarray):
+                    value = value.tolist()
+                formatted_values = map(str, value)
+                additional_info.append(f"{label}: {', '.join(formatted_values)}")
 
         logging.info("additional_info: %s", additional_info)
 
-        if additional_info:
-            content += "\n" + "\n".join(additional_info)
+        parts.extend(additional_info)
 
         # Add overlap comment if FOSP and LOSP are present
         if fosp is not None and losp is not None:
-            content += f"\nSP {fosp}-{losp} overlap"
+            parts.append(f"SP {fosp}-{losp} overlap")
             logging.info("Added overlap comment: SP %s-%s", fosp, losp)
 
-        return content
+        return "\n".join(parts)
 
     def _get_label_for_key(self, key: str) -> str:
         """
@@ -370,54 +801,150 @@ Percentage of shotpoints with Average depth of active source array at or within
         Returns:
             Human-readable label
         """
-        label_map = {
-            # Original QC checks
-            'log_sub_array_sep_flag': "SP with Sub-Array Sep <6.8m or >9.2m",
-            'log_gun_depth_flag': "SP with Gun Depth <6m or >8m",
-            'log_volume_flag': "SP with Volume <3040 cui",
-            'log_timing_warning': "SP with Gun Timing >1.0ms and <=1.5ms",
-            'log_timing_error': "SP with Gun Timing >1.5ms",
-            'log_gun_pressure_flag': "SP with Pressure <1900psi or >2100psi",
-            'log_sma_flag': "SP with SMA >3",
-            'log_gun_disabled_flag': "SP with Gun Disabled",
-            'log_misfire_flag': "SP with suspected misfire",
-            'log_autofires': "SP with suspected autofire",
-            'log_repeatability_flag': "SP with Radial >10.0m",
-
-            # Enhanced QC checks (Phase 4.3)
-            'log_sub_array_sep_percent_violation': "Sub-Array Separation Percentage Violation",
-            'log_sub_array_sep_avg_violation': "Sub-Array Separation Sequence Average Violation",
-            'log_gun_depth_sensor_violation': "Gun Depth Sensor Violations",
-            'log_consec_7_source_errors': "7+ Consecutive SP with Source Errors",
-            'log_window_12_of_24_source_errors': "12+ Source Errors in 24 SP Window",
-            'log_window_16_of_40_source_errors': "16+ Source Errors in 40 SP Window",
-            'log_percent_3_total_source_errors': "Source Errors Exceed 3% of Total SP",
-        }
-        return label_map.get(key, key)
+        return _LABELS.get(key, key)
 
     def _find_comments_cell(self, sheet) -> Optional[openpyxl.cell.Cell]:
         """
         Find the cell with "Acquisition and Processing Comments" label.
 
+        The label row from the previous lookup is tried first; the column B
+        scan only runs when that hint is missing or no longer holds the label.
+
         Args:
             sheet: Excel worksheet
 
         Returns:
             Target cell (one row below label), or None if not found
         """
-        for row in sheet['B:B']:
-            if row.value == self.comments_label:
-                target_cell = sheet.cell(row=row.row + 1, column=row.column)
-                return target_cell
+        hinted_row = self._comments_row_cache.get(sheet.title)
+        if hinted_row is not None and sheet.cell(row=hinted_row, column=2).value == self.comments_label:
+            return sheet.cell(row=hinted_row + 1, column=2)
+
+        # Stream column B lazily and stop at the label; sheet['B:B'] would
+        # materialise (and create) a cell for every row of the sheet first
+        column_b = sheet.iter_rows(min_col=2, max_col=2, values_only=True)
+        for row_num, (value,) in enumerate(column_b, start=1):
+            if value == self.comments_label:
+                self._comments_row_cache[sheet.title] = row_num
+                return sheet.cell(row=row_num + 1, column=2)
         return None
 
+    def _scan_sheet(self, sheet, cell_refs: Sequence[str], search_column: str,
+                    search_range: Tuple[int, int]) -> Tuple[Dict[str, object], Dict]:
+        """
+        Read metadata cells and shot point markers in a single iter_rows pass.
+
+        Streams one block covering the metadata cells and the marker table
+        (columns B/C plus the search column) instead of fetching cells one by
+        one, which under read_only re-walks the row stream for every lookup.
+
+        Args:
+            sheet: Excel worksheet (normal or read-only)
+            cell_refs: Metadata cell references to collect (e.g. ['C6', 'E8'])
+            search_column: Column searched for marker keywords (e.g. 'F')
+            search_range: Tuple of (start_row, end_row) of the marker table
+
+        Returns:
+            Tuple of ({cell_ref: value}, markers) where cell references are
+            upper-cased and markers has the extract_shot_point_markers() layout
+        """
+        markers = dict.fromkeys(_MARKER_NAMES)
+        start_row, end_row = search_range
+
+        # Group metadata cells by row so each streamed row is dispatched once
+        cell_values: Dict[str, object] = {}
+        cells_by_row: Dict[int, List[Tuple[str, int]]] = {}
+        for ref in cell_refs:
+            ref = ref.upper()
+            row, col = coordinate_to_tuple(ref)
+            cell_values[ref] = None
+            cells_by_row.setdefault(row, []).append((ref, col))
+
+        # Bounding box: B (time), C (SP), the search column and all metadata cells
+        search_col_idx = column_index_from_string(search_column)
+        cols = [2, 3, search_col_idx] + [col for cells in cells_by_row.values() for _, col in cells]
+        min_col, max_col = min(cols), max(cols)
+        min_row = min([start_row, *cells_by_row])
+        max_row = max([end_row, *cells_by_row])
+        time_pos, sp_pos, search_pos = 2 - min_col, 3 - min_col, search_col_idx - min_col
+
+        rows = sheet.iter_rows(min_row=min_row, max_row=max_row,
+                               min_col=min_col, max_col=max_col, values_only=True)
+
+        for row_num, row_values in enumerate(rows, start=min_row):
+            for ref, col in cells_by_row.get(row_num, ()):
+                cell_values[ref] = row_values[col - min_col]
+
+            if not start_row <= row_num <= end_row:
+                continue
+
+            cell_value = row_values[search_pos]
+            if not cell_value:
+                continue
+
+            cell_str = _clean_str(cell_value)
+
+            # Of the marker keywords in the cell, keep the first in marker order
+            found = {match.group(0).upper() for match in _MARKER_RE.finditer(cell_str)}
+            if not found:
+                continue
+            marker_key = sys.intern(min(found, key=_MARKER_RANK.__getitem__))
+
+            # Extract time from column B
+            time_cell = row_values[time_pos]
+            time_str = str(time_cell) if time_cell else None
+
+            # Extract shot point from column C
+            sp_cell = row_values[sp_pos]
+            sp_num = None
+            if sp_cell is not None:
+                try:
+                    sp_num = int(sp_cell)
+                except (ValueError, TypeError):
+                    logging.warning(f"Could not parse SP at row {row_num}: {sp_cell}")
+
+            # Store marker data
+            markers[marker_key] = {
+                'time': time_str,
+                'sp': sp_num,
+                'row': row_num,
+                'description': cell_str
+            }
+
+            logging.debug(f"Found {marker_key} at row {row_num}: SP={sp_num}, Time={time_str}")
+
+        return cell_values, markers
+
+    def _snapshot_values(self, sheet) -> Dict[str, object]:
+        """
+        Get the {cell_ref: value} snapshot of a streamed sheet, reading it on first use.
+
+        Args:
+            sheet: Read-only worksheet (openpyxl ReadOnlyWorksheet or calamine facade)
+
+        Returns:
+            Dictionary of non-empty cell values keyed by cell reference (e.g. 'C6')
+        """
+        values = self._sheet_values.get(sheet)
+        if values is None:
+            values = {f"{get_column_letter(col)}{row}": value
+                      for row, row_values in enumerate(sheet.iter_rows(values_only=True), start=1)
+                      for col, value in enumerate(row_values, start=1)
+                      if value is not None}
+            self._sheet_values[sheet] = values
+        return values
+
     def _get_cell_value(self, sheet, config_key: str, default_cell: str,
                        value_type: type = str):
         """
         Get cell value from Excel sheet using configurable cell reference.
 
+        Read-only (streamed) sheets are read once into a {cell_ref: value}
+        snapshot on first access instead of re-parsing per cell.
+
         Args:
-            sheet: Excel worksheet object
+            sheet: Excel worksheet object, or a {cell_ref: value} dict
+                   collected by _scan_sheet()
             config_key: Configuration key for cell reference (e.g., 'cell_filename')
             default_cell: Default cell reference if config key not found
             value_type: Type to convert value to (str, int, float)
@@ -425,15 +952,20 @@ Percentage of shotpoints with Average depth of active source array at or within
         Returns:
             Parsed value from cell, or None if cell is empty or parsing fails
         """
-        cell_ref = self.config.get('LineLog', config_key, fallback=default_cell)
-        cell_value = sheet[cell_ref].value
+        cell_ref = self._cell_refs.get(config_key, default_cell)
+        if isinstance(sheet, (ReadOnlyWorksheet, _CalamineSheet)):
+            sheet = self._snapshot_values(sheet)
+        if isinstance(sheet, dict):
+            cell_value = sheet.get(cell_ref.upper())
+        else:
+            cell_value = sheet[cell_ref].value
 
         if cell_value is None:
             return None
 
         try:
             if value_type == str:
-                return str(cell_value).strip()
+                return _clean_str(cell_value)
             elif value_type == int:
                 return int(cell_value)
             elif value_type == float:
@@ -444,6 +976,48 @@ Percentage of shotpoints with Average depth of active source array at or within
             logging.warning(f"Could not parse cell {cell_ref} as {value_type.__name__}: {cell_value}")
             return None
 
+    def _marker_search_params(self) -> Tuple[str, Tuple[int, int]]:
+        """
+        Get the configured marker search column and (start_row, end_row) range.
+
+        Returns:
+            Tuple of (search_column, (start_row, end_row))
+        """
+        search_column = self.config.get('LineLog', 'marker_search_column', fallback='F')
+        start_row = self.config.getint('LineLog', 'marker_search_start_row', fallback=18)
+        end_row = self.config.getint('LineLog', 'marker_search_end_row', fallback=50)
+        return search_column, (start_row, end_row)
+
+    def extract_many(self, file_paths: Sequence[str],
+                     max_workers: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Run extract_line_info() for several line logs in worker processes.
+
+        Workbook parsing is CPU-bound pure Python, so files are spread over a
+        process pool; each worker only receives the path and the flattened
+        [LineLog] options. A single file, or a frozen (PyInstaller) build, is
+        extracted in-process: spawning workers from a frozen GUI relaunches
+        the executable unless the entry point calls freeze_support().
+
+        Args:
+            file_paths: Paths to line log .xlsm files
+            max_workers: Worker process count (default: one per CPU, capped
+                         at the number of files)
+
+        Returns:
+            Dictionary mapping each path to its extract_line_info() result
+        """
+        file_paths = list(dict.fromkeys(file_paths))
+        if len(file_paths) <= 1 or getattr(sys, 'frozen', False):
+            return {path: self.extract_line_info(path) for path in file_paths}
+
+        max_workers = max_workers or min(len(file_paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(_extract_one, file_paths,
+                                   [self._cell_refs] * len(file_paths),
+                                   [self.backend] * len(file_paths))
+            return dict(zip(file_paths, results))
+
     def extract_line_info(self, file_path: str) -> Dict:
         """
         Extract comprehensive line log information including markers, metadata, and calculations.
@@ -482,15 +1056,30 @@ Percentage of shotpoints with Average depth of active source array at or within
                 }
             }
 
+        Results are memoized per file until its mtime or size changes or it is
+        updated through this manager. Each call returns fresh section dicts;
+        the marker entries inside them are shared and must not be modified.
+
         Example:
             line_info = manager.extract_line_info('path/to/linelog.xlsm')
             production_sp = line_info['calculated']['production_sp']
             line_name = line_info['metadata']['line']
             fgsp = line_info['markers']['FGSP']['sp']
         """
+        # Serve an unchanged file from the memo
+        abs_path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(file_path)
+            file_key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_key = None
+        cached = self._line_info_cache.get(abs_path)
+        if cached is not None and file_key is not None and cached[0] == file_key:
+            return _copy_line_info(cached[1])
+
         # Initialize result structure
         result = {
-            'markers': {},
+            'markers': dict.fromkeys(_MARKER_NAMES),
             'metadata': {
                 'filename': None,
                 'line': None,
@@ -506,11 +1095,7 @@ Percentage of shotpoints with Average depth of active source array at or within
             }
         }
 
-        # Extract markers using existing method
-        result['markers'] = self.extract_shot_point_markers(file_path)
-
-        # Open workbook for metadata extraction
-        wb = self.open_workbook_with_retry(file_path)
+        wb = self._load_readonly(file_path)
         if not wb:
             logging.error("Failed to open workbook for line info extraction")
             return result
@@ -518,47 +1103,50 @@ Percentage of shotpoints with Average depth of active source array at or within
         try:
             sheet = wb.active
 
-            # Extract metadata from configured cells
-            result['metadata']['filename'] = self._get_cell_value(sheet, 'cell_filename', 'C6', str)
-            result['metadata']['line'] = self._get_cell_value(sheet, 'cell_line', 'C7', str)
-            result['metadata']['sequence'] = self._get_cell_value(sheet, 'cell_sequence', 'C8', int)
-            result['metadata']['attempt'] = self._get_cell_value(sheet, 'cell_attempt', 'C9', int)
-            result['metadata']['heading'] = self._get_cell_value(sheet, 'cell_heading', 'E8', float)
+            # Scan metadata cells and marker table in a single pass
+            cell_refs = [self._cell_refs.get(config_key, default_cell)
+                         for config_key, default_cell, _ in _METADATA_CELLS.values()]
+            cell_values, result['markers'] = self._scan_sheet(
+                sheet, cell_refs, *self._marker_search_params())
+
+            # Convert metadata from the scanned cells
+            for field, (config_key, default_cell, value_type) in _METADATA_CELLS.items():
+                result['metadata'][field] = self._get_cell_value(cell_values, config_key,
+                                                                 default_cell, value_type)
 
             # Get shot increment from config
             shot_increment = self.config.getint('LineLog', 'shot_increment', fallback=2)
             result['calculated']['shot_increment'] = shot_increment
 
-            # Calculate production SP
-            if result['markers']['FGSP'] and result['markers']['LGSP']:
-                fgsp = result['markers']['FGSP']['sp']
-                lgsp = result['markers']['LGSP']['sp']
-                if fgsp is not None and lgsp is not None:
-                    production_sp = (abs(lgsp - fgsp) // shot_increment) + 1
-                    result['calculated']['production_sp'] = production_sp
-                    logging.debug(f"Calculated production SP: {production_sp} (FGSP={fgsp}, LGSP={lgsp}, increment={shot_increment})")
-
-            # Check for overlap and calculate overlap SP
-            has_overlap = (result['markers']['FOSP'] is not None and
-                          result['markers']['LOSP'] is not None)
-            result['calculated']['has_overlap'] = has_overlap
-
-            if has_overlap:
-                fosp = result['markers']['FOSP']['sp']
-                losp = result['markers']['LOSP']['sp']
-                if fosp is not None and losp is not None:
-                    overlap_sp = (abs(losp - fosp) // shot_increment) + 1
-                    result['calculated']['overlap_sp'] = overlap_sp
-                    logging.debug(f"Calculated overlap SP: {overlap_sp} (FOSP={fosp}, LOSP={losp})")
-
+            # Presence masks: markers found, and markers with a parsed SP
+            markers = result['markers']
+            sps = {name: _marker_sp(markers, name) for name in _MARKER_NAMES}
+            marker_mask = sp_mask = 0
+            for name, bit in _MARKER_BITS.items():
+                if markers.get(name) is not None:
+                    marker_mask |= bit
+                    if sps[name] is not None:
+                        sp_mask |= bit
+
+            # Overlap requires both FOSP and LOSP markers
+            result['calculated']['has_overlap'] = marker_mask & _OVERLAP_MASK == _OVERLAP_MASK
+
+            # Calculate production SP and overlap SP where both bounding SPs are known
+            for field, (first, last, required) in _SHOT_COUNTS.items():
+                if sp_mask & required == required:
+                    count = _shot_count(sps[first], sps[last], shot_increment)
+                    result['calculated'][field] = count
+                    logging.debug(f"Calculated {field}: {count} ({first}={sps[first]}, "
+                                  f"{last}={sps[last]}, increment={shot_increment})")
+
+            if file_key is not None:
+                self._line_info_cache[abs_path] = (file_key, result)
+                return _copy_line_info(result)
             return result
 
         except Exception as e:
             logging.error(f"Error extracting line info: {str(e)}")
             return result
-        finally:
-            if wb:
-                wb.close()
 
     def extract_shot_point_markers(self, file_path: str,
                                    search_column: str = None,
@@ -592,77 +1180,22 @@ Percentage of shotpoints with Average depth of active source array at or within
             fgsp = markers['FGSP']['sp']  # 6823
             fgsp_time = markers['FGSP']['time']  # '08:39:00'
         """
-        # Initialize all markers as None
-        markers = {
-            'FASP': None,
-            'FGSP': None,
-            'LGSP': None,
-            'LSP': None,
-            'FOSP': None,
-            'LOSP': None
-        }
-
-        # Get search parameters from config if not provided
-        if search_column is None:
-            search_column = self.config.get('LineLog', 'marker_search_column', fallback='F')
+        default_column, default_range = self._marker_search_params()
+        search_column = search_column or default_column
+        search_range = search_range or default_range
 
-        if search_range is None:
-            start_row = self.config.getint('LineLog', 'marker_search_start_row', fallback=18)
-            end_row = self.config.getint('LineLog', 'marker_search_end_row', fallback=50)
-            search_range = (start_row, end_row)
-
-        wb = self.open_workbook_with_retry(file_path)
+        wb = self._load_readonly(file_path)
         if not wb:
             logging.error("Failed to open workbook for marker extraction")
-            return markers
+            return dict.fromkeys(_MARKER_NAMES)
 
         try:
-            sheet = wb.active
-            start_row, end_row = search_range
-
-            for row_num in range(start_row, end_row + 1):
-                cell_value = sheet[f'{search_column}{row_num}'].value
-
-                if not cell_value:
-                    continue
-
-                cell_str = str(cell_value).strip()
-
-                # Check for each marker keyword
-                for marker_key in markers.keys():
-                    if marker_key in cell_str.upper():
-                        # Extract time from column B
-                        time_cell = sheet[f'B{row_num}'].value
-                        time_str = str(time_cell) if time_cell else None
-
-                        # Extract shot point from column C
-                        sp_cell = sheet[f'C{row_num}'].value
-                        sp_num = None
-                        if sp_cell is not None:
-                            try:
-                                sp_num = int(sp_cell)
-                            except (ValueError, TypeError):
-                                logging.warning(f"Could not parse SP at row {row_num}: {sp_cell}")
-
-                        # Store marker data
-                        markers[marker_key] = {
-                            'time': time_str,
-                            'sp': sp_num,
-                            'row': row_num,
-                            'description': cell_str
-                        }
-
-                        logging.debug(f"Found {marker_key} at row {row_num}: SP={sp_num}, Time={time_str}")
-                        break  # Only match first marker keyword per cell
-
+            _, markers = self._scan_sheet(wb.active, (), search_column, search_range)
             return markers
 
         except Exception as e:
             logging.error(f"Error extracting shot point markers: {str(e)}")
-            return markers
-        finally:
-            if wb:
-                wb.close()
+            return dict.fromkeys(_MARKER_NAMES)
 
     def update_fasp_in_linelog(self, file_path: str, fasp_row: int, correct_sp: int, correct_time: str) -> bool:
         """
@@ -678,6 +1211,7 @@ Percentage of shotpoints with Average depth of active source array at or within
             True if update successful, False otherwise
         """
         wb = None
+        self.clear_workbook_cache()
         try:
             # Open workbook
             wb = self.open_workbook_with_retry(file_path)
@@ -700,6 +1234,7 @@ Percentage of shotpoints with Average depth of active source array at or within
 
             # Save the workbook
             wb.save(file_path)
+            self._line_info_cache.pop(os.path.abspath(file_path), None)
             logging.info(f"Successfully updated FASP in line log: {file_path}")
             return True
 
@@ -711,12 +1246,12 @@ Percentage of shotpoints with Average depth of active source array at or within
                 wb.close()
 
     @staticmethod
-    def detect_range(shot_points: List[int]) -> str:
+    def detect_range(shot_points: Union[np.ndarray, List[int]]) -> str:
         """
         Detect ranges of consecutive shot points with 2-step intervals.
 
         Args:
-            shot_points: List of shot point numbers
+            shot_points: List or np.ndarray of shot point numbers
 
         Returns:
             Formatted string with ranges and total count
@@ -725,36 +1260,38 @@ Percentage of shotpoints with Average depth of active source array at or within
             Input: [1001, 1003, 1005, 1011, 1013, 1015, 1017, 1031]
             Output: "Total 8 SP. 1001-1005, 1011-1017, 1031"
         """
-        if not shot_points:
+        # Sort the shot points to ensure proper ordering
+        sorted_points = np.sort(_as_sp_array(shot_points))
+        if sorted_points.size == 0:
             return ""
 
-        # Sort the shot points to ensure proper ordering
-        sorted_points = sorted(shot_points)
-        ranges = []
-        start = sorted_points[0]
-        end = sorted_points[0]
-
-        for i in range(1, len(sorted_points)):
-            current = sorted_points[i]
-            # Check if the current point continues the sequence (2-step interval)
-            if current == end + 2:
-                end = current
-            else:
-                # End of current range, start new range
-                if start == end:
-                    ranges.append(str(start))
-                else:
-                    ranges.append(f"{start}-{end}")
-                start = current
-                end = current
+        # A range breaks wherever the step is not exactly 2
+        breaks = np.flatnonzero(np.diff(sorted_points) != 2) + 1
+        starts = sorted_points[np.concatenate(([0], breaks))].tolist()
+        ends = sorted_points[np.concatenate((breaks - 1, [sorted_points.size - 1]))].tolist()
 
-        # Add the last range
-        if start == end:
-            ranges.append(str(start))
-        else:
-            ranges.append(f"{start}-{end}")
+        ranges = [str(start) if start == end else f"{start}-{end}"
+                  for start, end in zip(starts, ends)]
 
-        total_count = len(sorted_points)
+        total_count = sorted_points.size
         range_str = ", ".join(ranges)
 
         return f"Total {total_count} SP. {range_str}"
+
+
+def _extract_one(file_path: str, cell_refs: Dict[str, str], backend: str = 'openpyxl') -> Dict:
+    """
+    Process pool worker for LineLogManager.extract_many().
+
+    Args:
+        file_path: Path to line log .xlsm file
+        cell_refs: Flattened [LineLog] options of the calling manager
+        backend: Reader backend of the calling manager
+
+    Returns:
+        extract_line_info() result for file_path
+    """
+    # Values are already interpolated by the parent's ConfigParser
+    config = ConfigParser(interpolation=None)
+    config.read_dict({'LineLog': cell_refs})
+    return LineLogManager(config, backend).extract_line_info(file_path)
@@ -711,10 +711,10 @@ class QCValidator:
                 'sma_flag'
             ]
 
-            # Initialize log dictionary
+            # Initialize log dictionary (shot point lists are packed int32 arrays)
             log_data = {}
             for flag in flag_columns:
-                log_data[f"log_{flag}"] = []
+                log_data[f"log_{flag}"] = np.empty(0, dtype=np.int32)
 
             # Log shot points for each flag
             for flag in flag_columns:
@@ -724,43 +724,44 @@ class QCValidator:
 
                 flagged_records = df[df[flag].fillna(0) > 0]
 
+                if flag != 'gun_timing_flag':
+                    log_data[f"log_{flag}"] = flagged_records['shot_point'].dropna().to_numpy(dtype=np.int32)
+                    continue
+
                 for index, row in flagged_records.iterrows():
-                    if flag == 'gun_timing_flag':
-                        # Handle gun timing separately (warnings vs errors)
-                        timing_error_level = row[flag]
-
-                        timing_cols = [col for col in df.columns if
-                                     col.startswith('String') and 'Cluster' in col and 'Gun' in col and
-                                     not col.endswith('-Depth') and not col.endswith('-Pressure')]
-
-                        if timing_error_level == 1:  # Warning
-                            log_key = 'log_timing_warning'
-                            min_threshold = 1.0
-                            max_threshold = 1.5
-                        elif timing_error_level == 2:  # Error
-                            log_key = 'log_timing_error'
-                            min_threshold = 1.5
-                            max_threshold = float('inf')
-                        else:
-                            continue
-
-                        matching_guns = []
-                        for col in timing_cols:
-                            timing_value = abs(row[col]) if pd.notna(row[col]) else 0
-                            # Exclude special codes: 63, 61, 90
-                            if timing_value not in [63, 61, 90] and min_threshold < timing_value <= max_threshold:
-                                gun_parts = col.split('-')
-                                if len(gun_parts) >= 3:
-                                    gun_info = f"{gun_parts[0].replace('_', ' ')} {gun_parts[1].replace('_', ' ')} {gun_parts[2].replace('_', ' ')}"
-                                    matching_guns.append(gun_info)
-
-                        if log_key not in log_data:
-                            log_data[log_key] = []
-
-                        if matching_guns:
-                            log_data[log_key].append((row['shot_point'], matching_guns))
+                    # Handle gun timing separately (warnings vs errors)
+                    timing_error_level = row[flag]
+
+                    timing_cols = [col for col in df.columns if
+                                 col.startswith('String') and 'Cluster' in col and 'Gun' in col and
+                                 not col.endswith('-Depth') and not col.endswith('-Pressure')]
+
+                    if timing_error_level == 1:  # Warning
+                        log_key = 'log_timing_warning'
+                        min_threshold = 1.0
+                        max_threshold = 1.5
+                    elif timing_error_level == 2:  # Error
+                        log_key = 'log_timing_error'
+                        min_threshold = 1.5
+                        max_threshold = float('inf')
                     else:
-                        log_data[f"log_{flag}"].append(row['shot_point'])
+                        continue
+
+                    matching_guns = []
+                    for col in timing_cols:
+                        timing_value = abs(row[col]) if pd.notna(row[col]) else 0
+                        # Exclude special codes: 63, 61, 90
+                        if timing_value not in [63, 61, 90] and min_threshold < timing_value <= max_threshold:
+                            gun_parts = col.split('-')
+                            if len(gun_parts) >= 3:
+                                gun_info = f"{gun_parts[0].replace('_', ' ')} {gun_parts[1].replace('_', ' ')} {gun_parts[2].replace('_', ' ')}"
+                                matching_guns.append(gun_info)
+
+                    if log_key not in log_data:
+                        log_data[log_key] = []
+
+                    if matching_guns:
+                        log_data[log_key].append((row['shot_point'], matching_guns))
 
             # Check ALL rows for misfires and disabled guns
             timing_cols = [col for col in df.columns if
@@ -799,11 +800,10 @@ class QCValidator:
                         log_data['log_gun_disabled_flag'].append(shot_point_entry)
 
             # Log suspected autofires
-            log_data['log_autofires'] = []
+            log_data['log_autofires'] = np.empty(0, dtype=np.int32)
             if 'Raw: SST_GUN1 #Autofires' in df.columns:
-                for index, row in df.iterrows():
-                    if pd.notna(row['Raw: SST_GUN1 #Autofires']) and row['Raw: SST_GUN1 #Autofires'] > 0:
-                        log_data['log_autofires'].append(row['shot_point'])
+                autofire_mask = df['Raw: SST_GUN1 #Autofires'].fillna(0) > 0
+                log_data['log_autofires'] = df.loc[autofire_mask, 'shot_point'].dropna().to_numpy(dtype=np.int32)
             else:
                 logging.info("Column 'Raw: SST_GUN1 #Autofires' not found, skipping autofire check")
 
@@ -12,8 +12,73 @@ Date: 2025-09-30
 """
 
 import os
+import mmap
 import logging
-from typing import Dict, List, Tuple
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Files are scanned in blocks of this many bytes
+_SCAN_BLOCK = 1 << 20
+
+# Maximum number of per-file pattern counts kept by ShotPointVerifier
+_COUNT_CACHE_SIZE = 1024
+
+# Report separators
+_RULE = "=" * 60
+_THIN_RULE = "─" * 60
+
+
+def _count_prefixed_lines(blocks: Iterable[bytes], prefixes: Tuple[bytes, ...]) -> Dict[bytes, int]:
+    """
+    Count lines starting with each of several prefixes in one pass over a file.
+
+    A line starts at the beginning of the data or right after a newline or a
+    bare carriage return (as in text mode), so each block is searched with
+    bytes.count for every prefix preceded by a line break while it is in
+    cache. The last bytes of each block are carried into the next one so
+    matches spanning a block boundary are not missed.
+
+    Args:
+        blocks: Consecutive chunks of the file contents
+        prefixes: Line prefixes to look for
+
+    Returns:
+        Dict mapping each prefix to its number of matching lines
+    """
+    needles = [(p, len(p), b'\n' + p, b'\r' + p) for p in prefixes]
+    keep = max(len(p) for p in prefixes)
+    counts = dict.fromkeys(prefixes, 0)
+    tail = b'\n'  # the first line starts after a virtual line break
+    for block in blocks:
+        for p, n, lf, cr in needles:
+            edge = tail[-n:] + block[:n]
+            counts[p] += edge.count(lf) + edge.count(cr) + block.count(lf) + block.count(cr)
+        tail = (tail + block[-keep:])[-keep:]
+    return counts
+
+
+def _read_blocks(f) -> Iterator[bytes]:
+    """
+    Yield consecutive blocks of a binary file, read into one reused buffer.
+
+    The buffer is overwritten by the next read, so each block must be used
+    up before the generator is advanced. A new buffer is made per call, so
+    concurrent scans of different files do not share it.
+
+    Args:
+        f: File opened in binary mode
+
+    Yields:
+        The next chunk of the file
+    """
+    buf = bytearray(_SCAN_BLOCK)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            return
+        yield buf if n == len(buf) else buf[:n]
 
 
 class ShotPointVerifier:
@@ -37,8 +102,19 @@ class ShotPointVerifier:
         'p211': {'pattern': 'E2', 'desc': 'P2/11 File'}
     }
 
+    # Lower-case file extension -> FILE_PATTERNS key
+    _EXT_MAP = {ext.lower(): ext for ext in FILE_PATTERNS}
+
+    # Distinct patterns as bytes, all counted in the same pass over a file
+    _PREFIXES = tuple(dict.fromkeys(info['pattern'].encode('ascii')
+                                    for info in FILE_PATTERNS.values()))
+
     def __init__(self):
         """Initialize the ShotPointVerifier."""
+        # Pattern counts per (absolute path, mtime_ns, size); kept across
+        # reset_counts so re-verifying a directory skips unchanged files
+        self._count_cache: 'OrderedDict[Tuple[str, int, int], Dict[str, int]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.reset_counts()
 
     def reset_counts(self):
@@ -61,41 +137,81 @@ class ShotPointVerifier:
         """
         self.reset_counts()
 
+        # Count every file with a known extension in one directory pass
+        found = set()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                file_ext = self._EXT_MAP.get(entry.name.rpartition('.')[2].lower())
+                if file_ext and entry.is_file():
+                    found.add(file_ext)
+                    self._count_shot_points(entry.path, file_ext)
+
         # Check for required files
-        all_files = os.listdir(directory)
         for ext in self.FILE_PATTERNS.keys():
-            matching_files = [f for f in all_files if f.lower().endswith(ext.lower())]
-            if not matching_files:
+            if ext not in found:
                 self.missing_files.append(self.FILE_PATTERNS[ext]['desc'])
-            else:
-                for file_name in matching_files:
-                    self._count_shot_points(os.path.join(directory, file_name))
 
         # Generate report
         return self._generate_report()
 
-    def _count_shot_points(self, file_path: str) -> None:
+    def verify_many(self, directories: Sequence[str],
+                    max_workers: Optional[int] = None) -> Dict[str, Tuple[bool, str]]:
+        """
+        Run verify_directory() for several directories in worker threads.
+
+        Each directory gets its own ShotPointVerifier sharing this one's count
+        cache, so the counts, missing_files and error_files of this instance
+        are left untouched. Time is mostly spent waiting on the file system
+        (listing, stat, open, page-ins), which matters most for production
+        directories on network shares, so threads rather than processes are used.
+        A single directory is verified in-process.
+
+        Args:
+            directories: Paths to the directories to verify
+            max_workers: Worker thread count (default: four per CPU, at most
+                         32 and at most the number of directories)
+
+        Returns:
+            Dictionary mapping each directory to its verify_directory() result
+
+        Raises:
+            FileNotFoundError: If a directory does not exist, as verify_directory()
+        """
+        directories = list(dict.fromkeys(directories))
+        if len(directories) <= 1:
+            return {directory: self._verify_isolated(directory) for directory in directories}
+
+        max_workers = max_workers or min(len(directories), 32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(self._verify_isolated, directories)
+            return dict(zip(directories, results))
+
+    def _verify_isolated(self, directory: str) -> Tuple[bool, str]:
+        """verify_directory() on a new verifier that shares only this one's count cache."""
+        verifier = ShotPointVerifier()
+        verifier._count_cache = self._count_cache
+        verifier._cache_lock = self._cache_lock
+        return verifier.verify_directory(directory)
+
+    def _count_shot_points(self, file_path: str, file_ext: Optional[str] = None) -> None:
         """
         Count shot points in a single file.
 
         Args:
             file_path: Path to the file to count shot points in
+            file_ext: FILE_PATTERNS key for the file, looked up from its
+                extension when not given
         """
         file_name = os.path.basename(file_path)
-        file_ext = next((ext for ext in self.FILE_PATTERNS.keys()
-                        if file_name.lower().endswith(ext.lower())), None)
+        if file_ext is None:
+            file_ext = self._EXT_MAP.get(file_name.rpartition('.')[2].lower())
 
         if not file_ext:
             return
 
         try:
-            count = 0
-            pattern = self.FILE_PATTERNS[file_ext]['pattern']
-
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line in f:
-                    if line.startswith(pattern):
-                        count += 1
+            # p190 and S00 share 'S', so pick the count by extension after the scan
+            count = self._cached_count_file(file_path)[self.FILE_PATTERNS[file_ext]['pattern']]
 
             self.counts[file_ext]['count'] = count
             self.counts[file_ext]['files'].append(file_name)
@@ -104,6 +220,80 @@ class ShotPointVerifier:
             logging.error(f"Error reading {file_name}: {exc}")
             self.error_files.append((file_name, str(exc)))
 
+    def _cached_count_file(self, file_path: str) -> Dict[str, int]:
+        """
+        Get the pattern counts of a file, reusing them while the file is unchanged.
+
+        Entries are keyed by (absolute path, mtime_ns, size), so a rewritten
+        file is scanned again even where mtime resolution is coarse.
+
+        Args:
+            file_path: Path to the file to scan
+
+        Returns:
+            Dict mapping each pattern to its line count, as _count_all
+        """
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+        with self._cache_lock:
+            counts = self._count_cache.get(key)
+            if counts is not None:
+                self._count_cache.move_to_end(key)
+                return counts
+
+        # Scan outside the lock so verify_many() threads do not serialise here
+        counts = self._count_file(file_path)
+        with self._cache_lock:
+            self._count_cache[key] = counts
+            if len(self._count_cache) > _COUNT_CACHE_SIZE:
+                self._count_cache.popitem(last=False)
+        return counts
+
+    def clear_count_cache(self) -> None:
+        """Drop all cached per-file pattern counts."""
+        with self._cache_lock:
+            self._count_cache.clear()
+
+    @classmethod
+    def _count_all(cls, data: Union[bytes, Iterable[bytes]]) -> Dict[str, int]:
+        """
+        Count the lines starting with every known pattern in one pass.
+
+        Args:
+            data: File contents, whole or as consecutive blocks
+
+        Returns:
+            Dict mapping each pattern (e.g. 'S', 'E1000', 'E2') to its line count
+        """
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = (data,)
+        counts = _count_prefixed_lines(data, cls._PREFIXES)
+        return {prefix.decode('ascii'): count for prefix, count in counts.items()}
+
+    @classmethod
+    def _count_file(cls, file_path: str) -> Dict[str, int]:
+        """
+        Count the lines of a file starting with every known pattern.
+
+        The file is memory-mapped and scanned as raw bytes, so lines are
+        never decoded or split. Files that cannot be mapped (empty files,
+        pipes) are read block by block into a reused buffer instead.
+
+        Args:
+            file_path: Path to the file to scan
+
+        Returns:
+            Dict mapping each pattern to its line count, as _count_all
+        """
+        with open(file_path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                return cls._count_all(_read_blocks(f))
+            with mm:
+                return cls._count_all(mm[i:i + _SCAN_BLOCK] for i in range(0, len(mm), _SCAN_BLOCK))
+
     def _generate_report(self) -> Tuple[bool, str]:
         """
         Generate a detailed, user-friendly report of the verification results.
@@ -111,122 +301,117 @@ class ShotPointVerifier:
         Returns:
             Tuple of (is_consistent, report_message)
         """
-        report = []
-
         # Header
-        report.append("=" * 60)
-        report.append("  SHOT POINT VERIFICATION REPORT")
-        report.append("=" * 60)
-        report.append("")
+        report = [_RULE, "  SHOT POINT VERIFICATION REPORT", _RULE, ""]
 
         # Handle missing files
         if self.missing_files:
-            report.append("✗ STATUS: MISSING FILES")
-            report.append("")
-            report.append("─" * 60)
-            report.append("MISSING REQUIRED FILES:")
-            report.append("─" * 60)
-            for f in self.missing_files:
-                report.append(f"  ✗ {f}")
-            report.append("")
-            report.append("=" * 60)
-            report.append("Action Required: Please ensure all required files are present.")
-            report.append("=" * 60)
+            report += [
+                "✗ STATUS: MISSING FILES",
+                "",
+                f"Missing Required Files: {len(self.missing_files)} of {len(self.FILE_PATTERNS)} file types not found.",
+                "",
+                _THIN_RULE,
+                "MISSING REQUIRED FILES:",
+                _THIN_RULE,
+            ]
+            report += [f"  ✗ {f}" for f in self.missing_files]
+            report += ["", _RULE, "Action Required: Please ensure all required files are present.", _RULE]
             return False, "\n".join(report)
 
         # Handle errors
         if self.error_files:
-            report.append("✗ STATUS: ERRORS ENCOUNTERED")
-            report.append("")
-            report.append("─" * 60)
-            report.append("ERRORS READING FILES:")
-            report.append("─" * 60)
+            report += [
+                "✗ STATUS: ERRORS ENCOUNTERED",
+                "",
+                f"Errors encountered while reading {len(self.error_files)} file(s).",
+                "",
+                _THIN_RULE,
+                "ERRORS READING FILES:",
+                _THIN_RULE,
+            ]
             for name, error in self.error_files:
-                report.append(f"  ✗ {name}")
-                report.append(f"     Error: {error}")
-                report.append("")
-            report.append("=" * 60)
-            report.append("Action Required: Fix file issues and retry verification.")
-            report.append("=" * 60)
+                report += [f"  ✗ {name}", f"     Error: {error}", ""]
+            report += [_RULE, "Action Required: Fix file issues and retry verification.", _RULE]
             return False, "\n".join(report)
 
-        # Get non-zero counts
+        # Counts of the file types that were read; one distinct value means consistent
         valid_counts = {ext: data['count'] for ext, data in self.counts.items()
-                       if data['count'] > 0}
-
-        if not valid_counts:
-            report.append("⚠ STATUS: NO DATA FOUND")
-            report.append("")
-            report.append("No shot points found in any files.")
-            report.append("")
-            report.append("=" * 60)
-            report.append("Action Required: Check that files contain valid data.")
-            report.append("=" * 60)
+                        if data['files']}
+        distinct = set(valid_counts.values())
+
+        if not distinct - {0}:
+            report += [
+                "⚠ STATUS: NO DATA FOUND",
+                "",
+                "No shot points found in any files.",
+                "",
+                _RULE,
+                "Action Required: Check that files contain valid data.",
+                _RULE,
+            ]
             return False, "\n".join(report)
 
-        # Check if all counts match
-        first_count = next(iter(valid_counts.values()))
-        is_consistent = all(count == first_count for count in valid_counts.values())
+        # Reference count for the breakdown: the first non-zero one
+        first_count = next(count for count in valid_counts.values() if count)
+        is_consistent = len(distinct) == 1
 
         # Status Summary
         if is_consistent:
-            report.append("✓ STATUS: ALL FILES CONSISTENT")
+            report += ["✓ STATUS: ALL FILES CONSISTENT", "",
+                       f"Each file type contains {first_count:,} shot points."]
         else:
-            report.append("✗ STATUS: MISMATCH DETECTED")
-
-        report.append("")
-        report.append(f"Total Shot Points: {first_count:,}" if is_consistent else "Total Shot Points: VARIES (see below)")
-        report.append(f"Files Verified: {len(valid_counts)}")
-        report.append("")
-
-        # Detailed File Counts
-        report.append("─" * 60)
-        report.append("FILE-BY-FILE BREAKDOWN:")
-        report.append("─" * 60)
+            report += ["✗ STATUS: MISMATCH DETECTED", "",
+                       "Mismatch detected: shot point counts differ between file types."]
+
+        report += [
+            "",
+            f"Total Shot Points: {first_count:,}" if is_consistent else "Total Shot Points: VARIES (see below)",
+            f"Files Verified: {len(valid_counts)}",
+            "",
+            # Detailed File Counts
+            _THIN_RULE,
+            "FILE-BY-FILE BREAKDOWN:",
+            _THIN_RULE,
+        ]
 
         for ext, data in self.counts.items():
-            if data['count'] > 0:
-                desc = self.FILE_PATTERNS[ext]['desc']
+            if data['files']:
                 count = data['count']
-                files = ', '.join(data['files'])
-
                 # Mark consistency
-                if is_consistent:
-                    icon = "✓"
-                elif count == first_count:
-                    icon = "✓"
-                else:
-                    icon = "✗"
-
-                report.append(f"  {icon} {desc}:")
-                report.append(f"     Shot Points: {count:,}")
-                report.append(f"     Files: {files}")
-                report.append("")
+                icon = "✓" if is_consistent or count == first_count else "✗"
+                report += [
+                    f"  {icon} {self.FILE_PATTERNS[ext]['desc']}:",
+                    f"     Shot Points: {count:,}",
+                    f"     Files: {', '.join(data['files'])}",
+                    "",
+                ]
 
         # Summary Section
-        report.append("─" * 60)
+        report.append(_THIN_RULE)
         if is_consistent:
-            report.append("VERIFICATION RESULT:")
-            report.append("─" * 60)
-            report.append(f"✓ All files have matching shot point count: {first_count:,}")
-            report.append("")
-            report.append("=" * 60)
-            report.append("Status: Data consistency verified successfully")
-            report.append("=" * 60)
+            report += [
+                "VERIFICATION RESULT:",
+                _THIN_RULE,
+                f"✓ All files have matching shot point count: {first_count:,}",
+                "",
+                _RULE,
+                "Status: Data consistency verified successfully",
+                _RULE,
+            ]
         else:
-            report.append("MISMATCH DETAILS:")
-            report.append("─" * 60)
-            report.append("The following files have different shot point counts:")
-            report.append("")
+            report += [
+                "MISMATCH DETAILS:",
+                _THIN_RULE,
+                "The following files have different shot point counts:",
+                "",
+            ]
             for ext, data in self.counts.items():
-                if data['count'] > 0 and data['count'] != first_count:
+                if data['files'] and data['count'] != first_count:
                     desc = self.FILE_PATTERNS[ext]['desc']
                     diff = data['count'] - first_count
                     sign = "+" if diff > 0 else ""
                     report.append(f"  ✗ {desc}: {data['count']:,} shot points ({sign}{diff:,})")
-            report.append("")
-            report.append("=" * 60)
-            report.append("Action Required: Investigate count discrepancies")
-            report.append("=" * 60)
+            report += ["", _RULE, "Action Required: Investigate count discrepancies", _RULE]
 
         return is_consistent, "\n".join(report)
@@ -6,8 +6,11 @@ This module provides shared fixtures for all tests.
 
 import os
 import sys
+import shutil
+import tempfile
 from pathlib import Path
 
+import pandas as pd
 import pytest
 
 # Add parent directory to path so we can import the main module
@@ -61,6 +64,29 @@ def config_file(project_root):
     return config_path
 
 
+# RAM-backed scratch space (tmpfs) for tests that save/load workbooks
+RAM_TMP_DIR = '/dev/shm'
+
+
+def _use_ram_basetemp(config):
+    """
+    Put pytest's base temp directory on tmpfs (/dev/shm) when available.
+
+    Line log tests save and reload .xlsm files repeatedly; keeping them in
+    RAM avoids block-device I/O. Called before pytest builds its temp path
+    factory, so the stock tmp_path/tmp_path_factory fixtures pick it up.
+    Skipped when --basetemp is given, inside xdist workers (they inherit
+    the controller's basetemp) and on hosts without a writable /dev/shm
+    (Windows, macOS), which keep pytest's default location.
+    """
+    if config.option.basetemp or hasattr(config, 'workerinput'):
+        return
+    if os.path.isdir(RAM_TMP_DIR) and os.access(RAM_TMP_DIR, os.W_OK):
+        basetemp = tempfile.mkdtemp(prefix='pxgeonavqc-', dir=RAM_TMP_DIR)
+        config.option.basetemp = basetemp
+        config.add_cleanup(lambda: shutil.rmtree(basetemp, ignore_errors=True))
+
+
 @pytest.fixture(scope="session")
 def sample_files(sample_production_dir, sample_processed_dir, sample_gundata_dir):
     """
@@ -130,11 +156,34 @@ def reset_qapp_state(qapp):
         qapp.processEvents()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def copy_on_write():
+    """
+    Run the suite under pandas Copy-on-Write and yield whether it is on.
+
+    pandas >= 3.0 always copies on write (touching the option only warns),
+    1.5/2.x need the option set, and older releases do not have it.
+    """
+    if int(pd.__version__.split('.')[0]) >= 3:
+        yield True
+        return
+    try:
+        pd.set_option('mode.copy_on_write', True)
+    except KeyError:  # OptionError, pandas < 1.5
+        yield False
+        return
+    yield True
+    pd.reset_option('mode.copy_on_write')
+
+
 # Markers for test categorization
+@pytest.hookimpl(tryfirst=True)
 def pytest_configure(config):
-    """Register custom markers."""
+    """Register custom markers and move the temp base directory to tmpfs."""
+    _use_ram_basetemp(config)
     config.addinivalue_line("markers", "unit: Unit tests for individual components")
     config.addinivalue_line("markers", "integration: Integration tests for full workflows")
     config.addinivalue_line("markers", "slow: Tests that take significant time to run")
     config.addinivalue_line("markers", "requires_gui: Tests that require GUI/display")
-    config.addinivalue_line("markers", "requires_sample_data: Tests that use Sample directory data")
\ No newline at end of file
+    config.addinivalue_line("markers", "requires_sample_data: Tests that use Sample directory data")
+    config.addinivalue_line("markers", "xdist_group: Keep tests on one pytest-xdist worker under --dist loadgroup")
\ No newline at end of file
@@ -15,17 +15,27 @@ Tests cover:
 
 import pytest
 import os
+import hashlib
 import re
+import shutil
+import sys
 import tempfile
+import numpy as np
 import pandas as pd
+from contextlib import closing
 from datetime import datetime
 from configparser import ConfigParser
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Alignment
 
+import line_log_manager as line_log_manager_module
 from line_log_manager import LineLogManager
 
 
+# Column layout of marker rows passed to create_test_workbook
+MARKER_COLUMNS = ['row', 'time', 'sp', 'marker']
+
+
 @pytest.fixture
 def mock_config():
     """Create mock configuration for tests."""
@@ -42,6 +52,46 @@ def line_log_manager(mock_config):
     return LineLogManager(mock_config)
 
 
+@pytest.fixture(scope="session")
+def _template_bytes(tmp_path_factory):
+    """Build a blank workbook once per session and return its file bytes."""
+    template = tmp_path_factory.mktemp("tpl") / "blank.xlsm"
+    wb = Workbook()
+    wb.save(str(template))
+    wb.close()
+    return template.read_bytes()
+
+
+@pytest.fixture(scope="session")
+def _linelog_template_bytes(tmp_path_factory):
+    """Build a minimal line log (comments label in B5) once per session."""
+    template = tmp_path_factory.mktemp("tpl") / "linelog.xlsm"
+    wb = Workbook()
+    sheet = wb.active
+    sheet['B5'].value = 'Acquisition and Processing Comments'
+    sheet['B6'].value = 'Old content'
+    sheet['E6'].value = 'Old date'
+    wb.save(str(template))
+    wb.close()
+    return template.read_bytes()
+
+
+@pytest.fixture
+def fresh_wb(_template_bytes, tmp_path):
+    """Copy the blank workbook template to a per-test file."""
+    test_file = tmp_path / "wb.xlsm"
+    test_file.write_bytes(_template_bytes)
+    return test_file
+
+
+@pytest.fixture
+def fresh_linelog(_linelog_template_bytes, tmp_path):
+    """Copy the line log template to a per-test file."""
+    test_file = tmp_path / "test_linelog.xlsm"
+    test_file.write_bytes(_linelog_template_bytes)
+    return test_file
+
+
 @pytest.fixture
 def sample_merged_df():
     """Create sample merged DataFrame for testing."""
@@ -106,6 +156,66 @@ class TestLineLogManagerInit:
         assert manager.max_attempts == 5  # fallback value
         assert manager.comments_label == 'Acquisition and Processing Comments'  # fallback
 
+    def test_initialization_resolves_cell_refs(self):
+        """Test that [LineLog] options are flattened once and missing sections are tolerated."""
+        config = ConfigParser()
+        config.add_section('LineLog')
+        config.set('LineLog', 'cell_line', 'D7')
+
+        assert LineLogManager(config)._cell_refs['cell_line'] == 'D7'
+        assert LineLogManager(ConfigParser())._cell_refs == {}
+
+    def test_initialization_tolerates_percent_in_template_path(self):
+        """Test that a literal '%' in a [LineLog] path does not abort construction."""
+        config = ConfigParser()
+        config.read_string("[LineLog]\n"
+                           "line_log_template = C:\\Logs\\100%\\template.xlsm\n"
+                           "cell_line = D7\n")
+
+        manager = LineLogManager(config)
+
+        assert manager.template_path == 'C:\\Logs\\100%\\template.xlsm'
+        assert manager._cell_refs['cell_line'] == 'D7'
+
+
+class TestCalamineBackend:
+    """Test the optional python-calamine read backend."""
+
+    class FakeCalamineSheet:
+        """Stand-in for a python-calamine sheet (numbers as floats, blanks as '')."""
+        name = 'Sheet1'
+
+        def __init__(self, rows):
+            self.rows = rows
+
+        def to_python(self, skip_empty_area=True, nrows=None):
+            return self.rows[:nrows]
+
+    def test_unknown_backend_rejected(self, mock_config):
+        """Test that unsupported backend names raise ValueError."""
+        with pytest.raises(ValueError, match='Unsupported line log backend'):
+            LineLogManager(mock_config, backend='xlrd')
+
+    def test_calamine_missing_falls_back_to_openpyxl(self, mock_config, monkeypatch):
+        """Test fallback to openpyxl when python-calamine is not installed."""
+        monkeypatch.setattr(line_log_manager_module, 'CalamineWorkbook', None)
+        assert LineLogManager(mock_config, backend='calamine').backend == 'openpyxl'
+
+    def test_calamine_sheet_matches_openpyxl_rows(self, line_log_manager):
+        """Test that the calamine facade pads rows and normalises values for _scan_sheet."""
+        rows = [['', '', '', '', '', ''] for _ in range(20)]
+        rows[5][2] = '3184P31885'           # C6
+        rows[7][2] = 1885.0                 # C8
+        rows[7][4] = 45.5                   # E8
+        rows[18] = ['', '08:39:00', 6823.0, '', '', 'FGSP']
+        sheet = line_log_manager_module._CalamineSheet(self.FakeCalamineSheet(rows))
+
+        cells, markers = line_log_manager._scan_sheet(sheet, ['C6', 'C8', 'E8', 'C9'], 'F', (18, 50))
+
+        assert cells == {'C6': '3184P31885', 'C8': 1885, 'E8': 45.5, 'C9': None}
+        assert markers['FGSP'] == {'time': '08:39:00', 'sp': 6823, 'row': 19, 'description': 'FGSP'}
+        assert markers['LGSP'] is None
+
 
 class TestFindLineLogFile:
     """Test find_line_log_file method."""
@@ -150,15 +260,9 @@ class TestFindLineLogFile:
 class TestOpenWorkbookWithRetry:
     """Test open_workbook_with_retry method."""
 
-    def test_open_workbook_success(self, line_log_manager, tmp_path):
+    def test_open_workbook_success(self, line_log_manager, fresh_wb):
         """Test successfully opening a workbook."""
-        # Create a valid Excel file
-        wb = Workbook()
-        test_file = tmp_path / "test.xlsm"
-        wb.save(str(test_file))
-        wb.close()
-
-        result_wb = line_log_manager.open_workbook_with_retry(str(test_file))
+        result_wb = line_log_manager.open_workbook_with_retry(str(fresh_wb))
         assert result_wb is not None
         result_wb.close()
 
@@ -167,6 +271,42 @@ class TestOpenWorkbookWithRetry:
         result = line_log_manager.open_workbook_with_retry('/nonexistent/file.xlsm')
         assert result is None
 
+    def test_load_readonly_reuses_parse_until_file_changes(self, line_log_manager, fresh_wb):
+        """Test that read-only workbooks are cached by (path, mtime, size) and closed on clear."""
+        first = line_log_manager._load_readonly(str(fresh_wb))
+        assert first is not None
+        assert line_log_manager._load_readonly(str(fresh_wb)) is first
+
+        # Re-saving the file bumps its mtime, so a fresh parse is returned
+        st = os.stat(fresh_wb)
+        os.utime(fresh_wb, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        second = line_log_manager._load_readonly(str(fresh_wb))
+        assert second is not first
+
+        line_log_manager.clear_workbook_cache()
+        assert not line_log_manager._workbook_cache
+        assert line_log_manager._load_readonly(str(fresh_wb)) is not second
+
+    def test_load_readonly_same_mtime_new_size(self, line_log_manager, fresh_wb):
+        """Test that a rewrite within the same mtime tick is still detected by size."""
+        first = line_log_manager._load_readonly(str(fresh_wb))
+        st = os.stat(fresh_wb)
+
+        wb = load_workbook(fresh_wb, keep_vba=True)
+        wb.active['A1'] = 'x' * 500
+        wb.save(fresh_wb)
+        wb.close()
+        os.utime(fresh_wb, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert os.stat(fresh_wb).st_size != st.st_size
+
+        assert line_log_manager._load_readonly(str(fresh_wb)) is not first
+        line_log_manager.clear_workbook_cache()
+
+    def test_load_readonly_nonexistent_file(self, line_log_manager):
+        """Test that a missing file is not cached."""
+        assert line_log_manager._load_readonly('/nonexistent/file.xlsm') is None
+        assert not line_log_manager._workbook_cache
+
 
 class TestGenerateContent:
     """Test _generate_content method."""
@@ -270,6 +410,25 @@ class TestGenerateContent:
         assert "1030-1054" in content
         assert "1060-1100" in content
 
+    def test_generate_content_with_int32_arrays(self, line_log_manager, sample_merged_df,
+                                                sample_percentages):
+        """Test content generation with packed int32 shot point arrays."""
+        log_data = {
+            'log_gun_depth_flag': np.array([1002, 1004], dtype=np.int32),
+            'log_repeatability_flag': np.array([1001, 1003, 1005, 1007], dtype=np.int32),
+            'log_volume_flag': np.empty(0, dtype=np.int32),
+        }
+
+        content = line_log_manager._generate_content(
+            sample_merged_df, sample_percentages, log_data, np.array([1009], dtype=np.int32), []
+        )
+
+        assert "SP with Gun Depth <6m or >8m: 1002, 1004" in content
+        assert "Total 4 SP. 1001-1007" in content
+        assert "Missing SP: 1009" in content
+        # Empty arrays are skipped like empty lists
+        assert "Volume" not in content
+
 
 class TestGetLabelForKey:
     """Test _get_label_for_key method."""
@@ -324,6 +483,38 @@ class TestFindCommentsCell:
 
         wb.close()
 
+    def test_find_comments_cell_uses_cached_row(self, line_log_manager):
+        """Test that the cached label row is reused and re-validated."""
+        wb = Workbook()
+        sheet = wb.active
+        sheet['B5'].value = 'Acquisition and Processing Comments'
+
+        assert line_log_manager._find_comments_cell(sheet).coordinate == 'B6'
+        assert line_log_manager._comments_row_cache[sheet.title] == 5
+        assert line_log_manager._find_comments_cell(sheet).coordinate == 'B6'
+
+        # Label moved: stale hint is ignored and the column is rescanned
+        sheet['B5'].value = None
+        sheet['B12'].value = 'Acquisition and Processing Comments'
+        assert line_log_manager._find_comments_cell(sheet).coordinate == 'B13'
+        assert line_log_manager._comments_row_cache[sheet.title] == 12
+
+        wb.close()
+
+    def test_find_comments_cell_stops_at_label(self, line_log_manager):
+        """Test that the column B scan stops at the label instead of touching every row."""
+        wb = Workbook()
+        sheet = wb.active
+        sheet['B5'].value = 'Acquisition and Processing Comments'
+        sheet['F500'].value = 'trailing data'
+
+        result = line_log_manager._find_comments_cell(sheet)
+
+        assert result.coordinate == 'B6'
+        assert not any(row > 6 and col == 2 for row, col in sheet._cells)
+
+        wb.close()
+
     def test_find_comments_cell_with_custom_label(self, mock_config):
         """Test finding comments cell with custom label."""
         mock_config.set('LineLog', 'acquisition_comments_label', 'Custom Comments Label')
@@ -378,6 +569,26 @@ class TestDetectRange:
         result = line_log_manager.detect_range([1001, 1003, 1005, 1020, 1030, 1032])
         assert result == "Total 6 SP. 1001-1005, 1020, 1030-1032"
 
+    def test_detect_range_int32_array(self, line_log_manager):
+        """Test range detection accepts an unsorted int32 array."""
+        shot_points = np.array([1017, 1001, 1003, 1005, 1011, 1013, 1015, 1031], dtype=np.int32)
+        result = line_log_manager.detect_range(shot_points)
+        assert result == "Total 8 SP. 1001-1005, 1011-1017, 1031"
+
+    def test_detect_range_empty_array(self, line_log_manager):
+        """Test range detection with empty array."""
+        assert line_log_manager.detect_range(np.empty(0, dtype=np.int32)) == ""
+
+    @pytest.mark.parametrize("shot_points", [
+        [1007.0, 1001.0, 1003.0, 1011.0],
+        np.array([1007.0, 1001.0, 1003.0, 1011.0]),
+        np.array([1007.0, np.nan, 1001.0, 1003.0, 1011.0]),
+    ], ids=['float_list', 'float_array', 'float_array_nan'])
+    def test_detect_range_float_input(self, line_log_manager, shot_points):
+        """Test float lists and arrays give the same integer ranges."""
+        result = line_log_manager.detect_range(shot_points)
+        assert result == "Total 4 SP. 1001-1003, 1007, 1011"
+
 
 class TestUpdateLineLog:
     """Test update_line_log method (integration-style tests)."""
@@ -396,18 +607,9 @@ class TestUpdateLineLog:
         assert result is False
 
     def test_update_line_log_success(self, line_log_manager, sample_merged_df,
-                                    sample_percentages, sample_log_data, tmp_path):
+                                    sample_percentages, sample_log_data, fresh_linelog):
         """Test successful line log update."""
-        # Create a test Excel file
-        wb = Workbook()
-        sheet = wb.active
-        sheet['B5'].value = 'Acquisition and Processing Comments'
-        sheet['B6'].value = 'Old content'
-        sheet['E6'].value = 'Old date'
-
-        test_file = tmp_path / "test_linelog.xlsm"
-        wb.save(str(test_file))
-        wb.close()
+        test_file = fresh_linelog
 
         # Update the line log
         result = line_log_manager.update_line_log(
@@ -422,38 +624,65 @@ class TestUpdateLineLog:
         assert result is True
 
         # Verify the update
+        with closing(load_workbook(str(test_file), read_only=True, data_only=True)) as wb:
+            sheet = wb.active
+
+            # Check date was updated
+            assert sheet['E6'].value == '01-Oct-25'
+
+            # Check content was updated
+            content = sheet['B6'].value
+            assert "Shooting Mode: 4D Source" in content
+            assert content != 'Old content'
+
+    def test_update_line_log_creates_from_template(self, line_log_manager, sample_merged_df,
+                                                   sample_percentages, sample_log_data,
+                                                   fresh_linelog, tmp_path):
+        """Test that a missing line log is created from the template before updating."""
+        target = tmp_path / "new_linelog.xlsm"
+
+        result = line_log_manager.update_line_log(
+            str(target), sample_merged_df, sample_log_data, [], sample_percentages, [],
+            template_path=str(fresh_linelog)
+        )
+
+        assert result is True
+        with closing(load_workbook(str(target), read_only=True, data_only=True)) as wb:
+            assert "Shooting Mode: 4D Source" in wb.active['B6'].value
+
+        # The template itself is left untouched
+        with closing(load_workbook(str(fresh_linelog), read_only=True, data_only=True)) as wb:
+            assert wb.active['B6'].value == 'Old content'
+
+    def test_update_workbook_in_memory(self, line_log_manager, sample_merged_df,
+                                       sample_percentages, sample_log_data):
+        """Test update_workbook mutates an in-memory workbook without touching disk."""
         wb = Workbook()
-        wb = line_log_manager.open_workbook_with_retry(str(test_file))
         sheet = wb.active
+        sheet['B5'].value = 'Acquisition and Processing Comments'
+        sheet['B6'].value = 'Old content'
 
-        # Check date was updated
-        assert sheet['E6'].value == '01-Oct-25'
+        result = line_log_manager.update_workbook(
+            wb, sample_merged_df, sample_log_data, [], sample_percentages, []
+        )
 
-        # Check content was updated
-        content = sheet['B6'].value
-        assert "Shooting Mode: 4D Source" in content
-        assert content != 'Old content'
+        assert result is True
+        assert sheet['E6'].value == '01-Oct-25'
+        assert "Shooting Mode: 4D Source" in sheet['B6'].value
+        assert sheet['B6'].alignment.wrap_text is True
 
         wb.close()
 
     def test_update_line_log_without_datetime_column(self, line_log_manager,
-                                                    sample_percentages, sample_log_data, tmp_path):
+                                                    sample_percentages, sample_log_data,
+                                                    fresh_linelog):
         """Test update when DataFrame doesn't have datetime_UTC column."""
         # Create DataFrame without datetime_UTC
         df = pd.DataFrame({
             'shot_point': [1001, 1002, 1003]
         })
 
-        # Create test Excel file
-        wb = Workbook()
-        sheet = wb.active
-        sheet['B5'].value = 'Acquisition and Processing Comments'
-        sheet['B6'].value = 'Old content'
-        sheet['E6'].value = 'Old date'
-
-        test_file = tmp_path / "test_linelog_no_datetime.xlsm"
-        wb.save(str(test_file))
-        wb.close()
+        test_file = fresh_linelog
 
         # Update should still succeed
         result = line_log_manager.update_line_log(
@@ -468,11 +697,39 @@ class TestUpdateLineLog:
         assert result is True
 
         # Verify date was NOT updated (remains old value)
-        wb = line_log_manager.open_workbook_with_retry(str(test_file))
-        sheet = wb.active
-        assert sheet['E6'].value == 'Old date'
+        with closing(load_workbook(str(test_file), read_only=True, data_only=True)) as wb:
+            assert wb.active['E6'].value == 'Old date'
 
-        wb.close()
+    def test_queue_update_flush_saves_once(self, line_log_manager, fresh_linelog, monkeypatch):
+        """Test that multiple queued edits to one file share a single save."""
+        import openpyxl
+
+        save_calls = []
+        original_save = openpyxl.Workbook.save
+
+        def counting_save(wb, filename):
+            save_calls.append(filename)
+            return original_save(wb, filename)
+
+        monkeypatch.setattr(openpyxl.Workbook, 'save', counting_save)
+
+        def set_b6(wb):
+            wb.active['B6'].value = 'First edit'
+            return True
+
+        def set_e6(wb):
+            wb.active['E6'].value = '02-Oct-25'
+            return True
+
+        line_log_manager.queue_update(str(fresh_linelog), set_b6)
+        line_log_manager.queue_update(str(fresh_linelog), set_e6)
+        assert line_log_manager.flush() is True
+        assert save_calls == [str(fresh_linelog)]
+        assert line_log_manager._pending == {}
+
+        with closing(line_log_manager.open_workbook_with_retry(str(fresh_linelog))) as wb:
+            assert wb.active['B6'].value == 'First edit'
+            assert wb.active['E6'].value == '02-Oct-25'
 
     def test_update_line_log_missing_comments_cell(self, line_log_manager, sample_merged_df,
                                                    sample_percentages, sample_log_data, tmp_path):
@@ -542,25 +799,46 @@ class TestEdgeCases:
 class TestExtractShotPointMarkers:
     """Test suite for shot point marker extraction functionality."""
 
-    @pytest.fixture
-    def create_test_workbook(self, tmp_path):
-        """Create a test workbook with shot point markers."""
-        def _create(markers_data):
-            wb = Workbook()
-            sheet = wb.active
+    @pytest.fixture(scope="session")
+    def marker_workbook_cache(self, tmp_path_factory):
+        """Per-worker store of marker workbooks keyed by their content hash."""
+        return {'dir': tmp_path_factory.mktemp("markers"), 'paths': {}}
 
-            # Add data to the workbook based on markers_data
-            # markers_data format: [(row, col_b, col_c, col_f), ...]
-            for row, time_val, sp_val, marker_val in markers_data:
-                sheet[f'B{row}'] = time_val
-                sheet[f'C{row}'] = sp_val
-                sheet[f'F{row}'] = marker_val
+    @pytest.fixture
+    def create_test_workbook(self, marker_workbook_cache):
+        """
+        Create a test workbook with shot point markers.
 
-            # Save to temporary file
-            file_path = tmp_path / "test_linelog.xlsm"
+        Workbooks are content-addressed: identical marker sets reuse the file
+        already saved by an earlier test (extraction never modifies it).
+        """
+        def _create(markers_data):
+            # markers_data: DataFrame or [(row, col_b, col_c, col_f), ...]
+            if not isinstance(markers_data, pd.DataFrame):
+                markers_data = pd.DataFrame(markers_data, columns=MARKER_COLUMNS, dtype=object)
+            markers_data = markers_data.astype(object).where(markers_data.notna(), None)
+
+            records = tuple(markers_data.itertuples(index=False, name=None))
+            key = hashlib.sha1(repr(records).encode()).hexdigest()
+            if key in marker_workbook_cache['paths']:
+                return marker_workbook_cache['paths'][key]
+
+            by_row = {int(rec.row): rec for rec in markers_data.itertuples(index=False)}
+            max_row = int(markers_data['row'].max()) if by_row else 0
+
+            # Write-only sheet: rows are appended densely from row 1
+            wb = Workbook(write_only=True)
+            sheet = wb.create_sheet()
+            for row_num in range(1, max_row + 1):
+                rec = by_row.get(row_num)
+                sheet.append([] if rec is None else [None, rec.time, rec.sp, None, None, rec.marker])
+
+            # Save to the shared cache directory
+            file_path = marker_workbook_cache['dir'] / f"{key}.xlsm"
             wb.save(file_path)
             wb.close()
 
+            marker_workbook_cache['paths'][key] = str(file_path)
             return str(file_path)
 
         return _create
@@ -601,6 +879,22 @@ class TestExtractShotPointMarkers:
         assert result['LSP'] is not None
         assert result['LSP']['sp'] == 8000
 
+    def test_extract_markers_from_dataframe_input(self, line_log_manager, create_test_workbook):
+        """Test that create_test_workbook also accepts a marker DataFrame."""
+        markers_df = pd.DataFrame({
+            'row': [18, 21, 23],
+            'time': ['08:34:00', '08:39:00', '09:34:00'],
+            'sp': [6735, 6823, 7871],
+            'marker': ['FASP', 'FGSP', 'LGSP'],
+        }, columns=MARKER_COLUMNS)
+
+        file_path = create_test_workbook(markers_df)
+        result = line_log_manager.extract_shot_point_markers(file_path)
+
+        assert result['FASP']['row'] == 18
+        assert result['FGSP']['sp'] == 6823
+        assert result['LGSP']['time'] == '09:34:00'
+
     def test_extract_markers_with_contaminated_text(self, line_log_manager, create_test_workbook):
         """Test extraction with real-world contaminated descriptions."""
         markers_data = [
@@ -730,12 +1024,26 @@ class TestExtractShotPointMarkers:
         file_path = create_test_workbook(markers_data)
         result = line_log_manager.extract_shot_point_markers(file_path)
 
-        # Should match FASP first (order in markers.keys())
+        # Should match FASP (first keyword in marker order)
         assert result['FASP'] is not None
         assert result['FASP']['sp'] == 6735
         # FGSP should not be matched from the same cell
         assert result['FGSP'] is None
 
+    @pytest.mark.parametrize("description", ['FGSP & FASP', 'fgsp, previously logged as FASP'])
+    def test_extract_markers_marker_order_beats_text_order(self, line_log_manager, create_test_workbook,
+                                                           description):
+        """Test that with two keywords in a cell, the one first in marker order wins."""
+        markers_data = [
+            (18, '08:34:00', 6823, description),
+        ]
+
+        file_path = create_test_workbook(markers_data)
+        result = line_log_manager.extract_shot_point_markers(file_path)
+
+        assert result['FASP']['sp'] == 6823
+        assert result['FGSP'] is None
+
     def test_extract_markers_has_overlap_check(self, line_log_manager, create_test_workbook):
         """Test helper logic for checking overlap scenario."""
         # With overlap
@@ -832,6 +1140,33 @@ class TestGetCellValue:
 
         wb.close()
 
+    def test_get_cell_value_read_only_sheet_snapshot(self, line_log_manager, create_test_sheet,
+                                                     tmp_path, monkeypatch):
+        """Test that read-only sheets are streamed once and then served from a snapshot."""
+        _, wb = create_test_sheet
+        file_path = tmp_path / "read_only.xlsx"
+        wb.save(file_path)
+        wb.close()
+
+        with closing(load_workbook(file_path, read_only=True)) as ro_wb:
+            sheet = ro_wb.active
+
+            assert line_log_manager._get_cell_value(sheet, 'cell_filename', 'C6', str) == '3184P31885'
+
+            # Further lookups must not stream the sheet again
+            monkeypatch.setattr(type(sheet), 'iter_rows', None)
+            assert line_log_manager._get_cell_value(sheet, 'cell_heading', 'E8', float) == 45.5
+            assert line_log_manager._get_cell_value(sheet, 'cell_empty', 'B10', str) is None
+            assert line_log_manager._get_cell_value(sheet, 'cell_spaced', 'B11', str) == 'spaced text'
+
+    def test_get_cell_value_clean_string_returned_as_is(self, line_log_manager):
+        """Test that values without edge whitespace are not re-allocated."""
+        cells = {'C7': 'Line 1', 'C8': '\tLine 2\n', 'C9': 1885}
+
+        assert line_log_manager._get_cell_value(cells, 'cell_line', 'C7', str) is cells['C7']
+        assert line_log_manager._get_cell_value(cells, 'cell_sequence', 'C8', str) == 'Line 2'
+        assert line_log_manager._get_cell_value(cells, 'cell_attempt', 'C9', str) == '1885'
+
     def test_get_cell_value_invalid_conversion(self, line_log_manager, create_test_sheet):
         """Test invalid type conversion returns None."""
         sheet, wb = create_test_sheet
@@ -859,6 +1194,20 @@ class TestGetCellValue:
 
         wb.close()
 
+    def test_get_cell_value_from_prefetched_cells(self, line_log_manager, create_test_sheet):
+        """Test reading values from a _scan_sheet() dict instead of the sheet."""
+        sheet, wb = create_test_sheet
+
+        cells, markers = line_log_manager._scan_sheet(sheet, ['C6', 'c8', 'E8', 'B11'], 'F', (18, 50))
+        assert cells == {'C6': '3184P31885', 'C8': 1885, 'E8': 45.5, 'B11': '  spaced text  '}
+        assert markers == dict.fromkeys(['FASP', 'FGSP', 'LGSP', 'LSP', 'FOSP', 'LOSP'])
+
+        assert line_log_manager._get_cell_value(cells, 'cell_sequence', 'C8', int) == 1885
+        assert line_log_manager._get_cell_value(cells, 'cell_spaced', 'B11', str) == 'spaced text'
+        assert line_log_manager._get_cell_value(cells, 'cell_missing', 'C9', int) is None
+
+        wb.close()
+
 
 class TestExtractLineInfo:
     """Test suite for extract_line_info method."""
@@ -984,19 +1333,161 @@ class TestExtractLineInfo:
         # Should handle missing markers gracefully
         assert result['calculated']['production_sp'] is None
 
+    def test_extract_line_info_marker_without_sp(self, mock_config, create_full_test_workbook):
+        """Test that markers with unparseable SPs skip the counts instead of failing."""
+        manager = LineLogManager(mock_config)
+
+        markers_data = [
+            (19, '08:37:00', 'n/a', 'FOSP'),
+            (20, '08:38:00', 6821, 'LOSP'),
+            (21, '08:39:00', 6823, 'FGSP'),
+            (23, '09:34:00', None, 'LGSP'),
+        ]
+
+        file_path = create_full_test_workbook(markers_data, {})
+        result = manager.extract_line_info(file_path)
+
+        assert result['metadata']['sequence'] == 1885
+        assert result['calculated']['production_sp'] is None
+        assert result['calculated']['has_overlap'] is True
+        assert result['calculated']['overlap_sp'] is None
+
+    def test_extract_line_info_single_pass(self, mock_config, create_full_test_workbook, monkeypatch):
+        """Test that metadata and markers come from one workbook open and one row scan."""
+        manager = LineLogManager(mock_config)
+        file_path = create_full_test_workbook([(21, '08:39:00', 6823, 'FGSP')], {'line': 'Line 7'})
+
+        calls = {'open': 0, 'scan': 0}
+        original_open = manager.open_workbook_with_retry
+        original_scan = manager._scan_sheet
+
+        def counting_open(*args, **kwargs):
+            calls['open'] += 1
+            return original_open(*args, **kwargs)
+
+        def counting_scan(*args, **kwargs):
+            calls['scan'] += 1
+            return original_scan(*args, **kwargs)
+
+        monkeypatch.setattr(manager, 'open_workbook_with_retry', counting_open)
+        monkeypatch.setattr(manager, '_scan_sheet', counting_scan)
+
+        result = manager.extract_line_info(file_path)
+
+        assert calls == {'open': 1, 'scan': 1}
+        assert result['metadata']['line'] == 'Line 7'
+        assert result['markers']['FGSP']['sp'] == 6823
+
+    def test_extract_calls_share_one_workbook_load(self, mock_config, create_full_test_workbook,
+                                                    monkeypatch):
+        """Test that markers and line info reads of one file parse the workbook once."""
+        import openpyxl
+
+        manager = LineLogManager(mock_config)
+        file_path = create_full_test_workbook([(21, '08:39:00', 6823, 'FGSP')], {})
+
+        loads = {'count': 0}
+        original_load = openpyxl.load_workbook
+
+        def counting_load(*args, **kwargs):
+            loads['count'] += 1
+            return original_load(*args, **kwargs)
+
+        monkeypatch.setattr(openpyxl, 'load_workbook', counting_load)
+
+        markers = manager.extract_shot_point_markers(file_path)
+        line_info = manager.extract_line_info(file_path)
+
+        assert loads['count'] == 1
+        assert markers == line_info['markers']
+        assert line_info['metadata']['sequence'] == 1885
+
+    def test_extract_many_matches_serial_extraction(self, mock_config, create_full_test_workbook):
+        """Test that extract_many returns the same results as per-file extraction."""
+        mock_config.set('LineLog', 'shot_increment', '2')
+        manager = LineLogManager(mock_config)
+
+        paths = []
+        for line, sp in (('Line 1', 6823), ('Line 2', 7001)):
+            created = create_full_test_workbook([(21, '08:39:00', sp, 'FGSP'),
+                                                 (23, '09:34:00', sp + 100, 'LGSP')],
+                                                {'line': line})
+            path = created.replace('.xlsm', f'_{sp}.xlsm')
+            os.replace(created, path)
+            paths.append(path)
+
+        results = manager.extract_many(paths, max_workers=2)
+
+        assert list(results) == paths
+        for path in paths:
+            assert results[path] == manager.extract_line_info(path)
+        assert results[paths[1]]['metadata']['line'] == 'Line 2'
+        assert results[paths[1]]['calculated']['production_sp'] == 51
+
+    def test_extract_many_runs_serially_when_frozen(self, mock_config, create_full_test_workbook,
+                                                    monkeypatch):
+        """Test that a frozen build never starts a process pool."""
+        manager = LineLogManager(mock_config)
+        first = create_full_test_workbook([(21, '08:39:00', 6823, 'FGSP')], {})
+        second = first.replace('.xlsm', '_2.xlsm')
+        shutil.copyfile(first, second)
+
+        def no_pool(*args, **kwargs):
+            raise AssertionError("process pool started in a frozen build")
+
+        monkeypatch.setattr(sys, 'frozen', True, raising=False)
+        monkeypatch.setattr(line_log_manager_module, 'ProcessPoolExecutor', no_pool)
+
+        results = manager.extract_many([first, second])
+
+        assert results[second]['markers']['FGSP']['sp'] == 6823
+
+    def test_extract_line_info_memoized_until_file_changes(self, mock_config, create_full_test_workbook,
+                                                         monkeypatch):
+        """Test that unchanged files are served from the memo with fresh section dicts."""
+        manager = LineLogManager(mock_config)
+        file_path = create_full_test_workbook([(21, '08:39:00', 6823, 'FGSP')], {})
+
+        first = manager.extract_line_info(file_path)
+        first['calculated']['production_sp'] = -1
+
+        scans = {'count': 0}
+        original_scan = manager._scan_sheet
+
+        def counting_scan(*args, **kwargs):
+            scans['count'] += 1
+            return original_scan(*args, **kwargs)
+
+        monkeypatch.setattr(manager, '_scan_sheet', counting_scan)
+
+        second = manager.extract_line_info(file_path)
+        assert scans['count'] == 0
+        assert second['markers']['FGSP']['sp'] == 6823
+        assert second['calculated']['production_sp'] is None
+
+        # A new mtime invalidates the memo
+        st = os.stat(file_path)
+        os.utime(file_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        manager.extract_line_info(file_path)
+        assert scans['count'] == 1
+
+        # So does a new size under an unchanged mtime
+        st = os.stat(file_path)
+        with open(file_path, 'ab') as f:
+            f.write(b'\0')
+        os.utime(file_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        manager.extract_line_info(file_path)
+        assert scans['count'] == 2
+
 
 class TestErrorHandling:
     """Test suite for error handling and edge cases."""
 
-    def test_open_workbook_with_retry_permission_error(self, line_log_manager, tmp_path, monkeypatch):
+    def test_open_workbook_with_retry_permission_error(self, line_log_manager, fresh_wb, monkeypatch):
         """Test retry logic when file is locked."""
         import openpyxl
 
-        # Create a test file
-        wb = Workbook()
-        test_file = tmp_path / "locked.xlsm"
-        wb.save(str(test_file))
-        wb.close()
+        test_file = fresh_wb
 
         # Mock openpyxl.load_workbook to raise PermissionError first 2 times
         call_count = {'count': 0}
@@ -1018,15 +1509,11 @@ class TestErrorHandling:
 
         result.close()
 
-    def test_open_workbook_with_retry_max_attempts_exceeded(self, line_log_manager, tmp_path, monkeypatch):
+    def test_open_workbook_with_retry_max_attempts_exceeded(self, line_log_manager, fresh_wb, monkeypatch):
         """Test that retry logic fails after max attempts."""
         import openpyxl
 
-        # Create a test file
-        wb = Workbook()
-        test_file = tmp_path / "always_locked.xlsm"
-        wb.save(str(test_file))
-        wb.close()
+        test_file = fresh_wb
 
         # Mock to always raise PermissionError
         def mock_load_workbook(*args, **kwargs):
@@ -1038,15 +1525,43 @@ class TestErrorHandling:
         result = line_log_manager.open_workbook_with_retry(str(test_file))
         assert result is None
 
-    def test_open_workbook_with_retry_other_exception(self, line_log_manager, tmp_path, monkeypatch):
+    def test_open_workbook_retry_backoff_and_deadline(self, mock_config, fresh_wb, monkeypatch):
+        """Test exponential backoff with jitter, capped by retry_max_delay and open_timeout."""
+        import openpyxl
+        import line_log_manager as llm
+
+        mock_config.set('LineLog', 'max_open_attempts', '10')
+        mock_config.set('LineLog', 'retry_base_delay', '1')
+        mock_config.set('LineLog', 'retry_max_delay', '3')
+        mock_config.set('LineLog', 'open_timeout', '6')
+        manager = LineLogManager(mock_config)
+
+        # Fake clock advanced by the requested sleeps
+        clock = {'now': 100.0}
+        delays = []
+
+        def fake_sleep(delay):
+            delays.append(delay)
+            clock['now'] += delay
+
+        def always_locked(*args, **kwargs):
+            raise PermissionError("File is always locked")
+
+        monkeypatch.setattr(llm.time, 'monotonic', lambda: clock['now'])
+        monkeypatch.setattr(llm.time, 'sleep', fake_sleep)
+        monkeypatch.setattr(llm.random, 'uniform', lambda a, b: b / 2)
+        monkeypatch.setattr(openpyxl, 'load_workbook', always_locked)
+
+        assert manager.open_workbook_with_retry(str(fresh_wb)) is None
+
+        # 1 + 0.5, 2 + 0.5, then 4.5 capped at 3 and cut to the 2s left before the deadline
+        assert delays == [1.5, 2.5, 2.0]
+
+    def test_open_workbook_with_retry_other_exception(self, line_log_manager, fresh_wb, monkeypatch):
         """Test handling of non-PermissionError exceptions."""
         import openpyxl
 
-        # Create a test file
-        wb = Workbook()
-        test_file = tmp_path / "corrupt.xlsm"
-        wb.save(str(test_file))
-        wb.close()
+        test_file = fresh_wb
 
         # Mock to raise different exception
         def mock_load_workbook(*args, **kwargs):
@@ -1059,19 +1574,12 @@ class TestErrorHandling:
         assert result is None
 
     def test_update_line_log_save_permission_error(self, line_log_manager, sample_merged_df,
-                                                   sample_percentages, sample_log_data, tmp_path, monkeypatch):
+                                                   sample_percentages, sample_log_data, fresh_linelog,
+                                                   monkeypatch):
         """Test handling of PermissionError during save."""
         import openpyxl
 
-        # Create test file
-        wb = Workbook()
-        sheet = wb.active
-        sheet['B5'].value = 'Acquisition and Processing Comments'
-        sheet['B6'].value = 'Old content'
-
-        test_file = tmp_path / "readonly_linelog.xlsm"
-        wb.save(str(test_file))
-        wb.close()
+        test_file = fresh_linelog
 
         # Mock save method to raise PermissionError
         def mock_save(*args, **kwargs):
@@ -1092,19 +1600,12 @@ class TestErrorHandling:
         assert result is False
 
     def test_update_line_log_save_other_exception(self, line_log_manager, sample_merged_df,
-                                                  sample_percentages, sample_log_data, tmp_path, monkeypatch):
+                                                  sample_percentages, sample_log_data, fresh_linelog,
+                                                  monkeypatch):
         """Test handling of other exceptions during save."""
         import openpyxl
 
-        # Create test file
-        wb = Workbook()
-        sheet = wb.active
-        sheet['B5'].value = 'Acquisition and Processing Comments'
-        sheet['B6'].value = 'Old content'
-
-        test_file = tmp_path / "error_linelog.xlsm"
-        wb.save(str(test_file))
-        wb.close()
+        test_file = fresh_linelog
 
         # Mock save method to raise different exception
         def mock_save(*args, **kwargs):
@@ -1165,6 +1666,22 @@ class TestErrorHandling:
         assert result['metadata']['filename'] is None
         assert result['calculated']['production_sp'] is None
 
+    def test_extract_line_info_scan_error_keeps_marker_keys(self, mock_config, tmp_path):
+        """Test a failing sheet scan still returns every marker key (as None)."""
+        # A bare column letter is not a valid cell reference, so the scan raises
+        mock_config.set('LineLog', 'cell_heading', 'E')
+        manager = LineLogManager(mock_config)
+
+        wb = Workbook()
+        wb.active['F18'] = 'FGSP'
+        test_file = tmp_path / "test_bad_ref.xlsm"
+        wb.save(str(test_file))
+        wb.close()
+
+        result = manager.extract_line_info(str(test_file))
+
+        assert result['markers'] == dict.fromkeys(['FASP', 'FGSP', 'LGSP', 'LSP', 'FOSP', 'LOSP'])
+
 
 class TestFilterLogDataByRange:
     """Test suite for _filter_log_data_by_range method (production shot filtering)."""
@@ -1181,6 +1698,19 @@ class TestFilterLogDataByRange:
         # Only 6840, 6860 should remain
         assert filtered['log_gun_depth_flag'] == [6840, 6860]
 
+    def test_filter_int32_array(self, line_log_manager):
+        """Test filtering packed int32 shot point arrays."""
+        log_data = {
+            'log_gun_depth_flag': np.array([6800, 6820, 6840, 6860, 6880], dtype=np.int32),
+            'log_volume_flag': np.array([6800, 6820], dtype=np.int32),
+        }
+
+        filtered = line_log_manager._filter_log_data_by_range(log_data, 6825, 6875)
+
+        np.testing.assert_array_equal(filtered['log_gun_depth_flag'], [6840, 6860])
+        assert filtered['log_gun_depth_flag'].dtype == np.int32
+        assert 'log_volume_flag' not in filtered
+
     def test_filter_tuple_list(self, line_log_manager):
         """Test filtering list of tuples (sp, [guns])."""
         log_data = {
@@ -1286,6 +1816,44 @@ class TestFilterLogDataByRange:
         # log_volume_flag should remain
         assert 'log_volume_flag' in filtered
 
+    def test_iter_filtered_log_data_streams_lists(self, line_log_manager):
+        """Test that the streaming filter yields single-use iterators and skips empty results."""
+        log_data = {
+            'log_gun_depth_flag': [6800, 6840, 6860],
+            'log_volume_flag': [6800, 6820],
+            'log_timing_error': [(6850, ['G1'])],
+            'log_sma_flag': [],
+        }
+
+        entries = list(line_log_manager._iter_filtered_log_data(log_data, 6825, 6875))
+
+        assert [key for key, _ in entries] == ['log_gun_depth_flag', 'log_timing_error']
+        depth = entries[0][1]
+        assert not isinstance(depth, list)
+        assert list(depth) == [6840, 6860]
+        assert list(depth) == []
+
+        # Without markers, non-empty entries pass through unchanged
+        unfiltered = dict(line_log_manager._iter_filtered_log_data(log_data, None, 6875))
+        assert unfiltered['log_volume_flag'] is log_data['log_volume_flag']
+        assert 'log_sma_flag' not in unfiltered
+
+    def test_filter_preserves_original_elements(self, line_log_manager):
+        """Test that masked filtering returns the original list items and parses spaced ranges."""
+        guns = ['G1', 'G2']
+        log_data = {
+            'log_timing_error': [(6800, guns), (np.int32(6840), guns), (6890, guns)],
+            'log_gun_depth_flag': [6820, np.int64(6850), 6860.0],
+            'log_gun_depth_sensor_violation': ['Sensor 2: 6810 - 6850', 'Sensor 3: n/a-x'],
+        }
+
+        filtered = line_log_manager._filter_log_data_by_range(log_data, 6825, 6875)
+
+        assert filtered['log_timing_error'] == [(6840, guns)]
+        assert filtered['log_timing_error'][0][1] is guns
+        assert filtered['log_gun_depth_flag'] == [6850, 6860.0]
+        assert filtered['log_gun_depth_sensor_violation'] == ['Sensor 2: 6825-6850', 'Sensor 3: n/a-x']
+
 
 class TestGenerateContentWithFiltering:
     """Test _generate_content with production shot filtering and overlap."""
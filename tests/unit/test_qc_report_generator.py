@@ -4,15 +4,19 @@ Unit tests for QC Report Generator Module
 Tests shot point sorting, dither checking, flag discrepancies, and percentage calculations.
 """
 
+import importlib.util
+import re
 import pytest
+import numpy as np
 import pandas as pd
-from configparser import ConfigParser
 from qc_report_generator import QCReportGenerator
 from data_importers import SPSImporter
 from config_manager import ConfigManager
 
 
-@pytest.fixture
+# Config, importer and generator are built once per session instead of once
+# per test; no test mutates them, so sharing one instance is safe.
+@pytest.fixture(scope="session")
 def test_config(config_file):
     """Load test configuration"""
     config = ConfigManager(config_file)
@@ -20,7 +24,7 @@ def test_config(config_file):
     return config.config
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sps_importer(test_config):
     """Create SPSImporter instance"""
     config_manager = ConfigManager()
@@ -28,110 +32,231 @@ def sps_importer(test_config):
     return SPSImporter(config_manager)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def qc_report_generator(test_config, sps_importer):
     """Create QCReportGenerator instance"""
     return QCReportGenerator(test_config, sps_importer)
 
 
-@pytest.fixture
+# Matches the generator's sorting-error messages (out of order, duplicate SP)
+_SORT_ERR_RE = re.compile(r'appears after|Duplicate')
+
+# Seeded generator shared by the synthetic fixtures (deterministic runs)
+_RNG = np.random.default_rng(42)
+
+# Flag dtypes the large frame is checked with; Arrow only when pyarrow is installed
+_FLAG_DTYPES = [
+    pytest.param('int8', id='int8'),
+    pytest.param('Int8', id='Int8'),
+    pytest.param('int8[pyarrow]', id='arrow',
+                 marks=pytest.mark.skipif(importlib.util.find_spec('pyarrow') is None,
+                                          reason='pyarrow is not installed')),
+]
+
+
+def _zeros(n):
+    """All-zero int8 flag column; _mkdf frames share it across their clean flags"""
+    return np.zeros(n, dtype=np.int8)
+
+
+def _mkdf(cols):
+    """Build a frame from typed arrays without inferring dtypes or copying buffers"""
+    return pd.DataFrame(cols, copy=False)
+
+
+_ZEROS_3 = _zeros(3)
+_ZEROS_6 = _zeros(6)
+
+# Canonical input frames, built once at import. The QC methods under test
+# only read their input, so every test shares these objects.
+_DF_ASCENDING = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005, 1007, 1009, 1011], dtype=np.int32),
+    'shot_dither': np.array([0.5, 0.3, 0.4, 0.2, 0.1, 0.3], dtype=np.float32),
+    'sti_flag': np.array([0, 0, 2, 0, 0, 0], dtype=np.int8),
+    'volume_flag': np.array([0, 2, 0, 0, 2, 0], dtype=np.int8),
+    'gun_depth_flag': _ZEROS_6,
+    'SP Point QC': np.array([0, 1, 0, 0, 1, 0], dtype=np.int8)
+})
+
+_DF_DESCENDING = _mkdf({
+    'shot_point': np.array([1011, 1009, 1007, 1005, 1003, 1001], dtype=np.int32),
+    'shot_dither': np.array([0.5, 0.3, 0.4, 0.2, 0.1, 0.3], dtype=np.float32)
+})
+
+_DF_OUT_OF_ORDER = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005, 1003, 1009], dtype=np.int32)  # 1003 appears twice
+})
+
+_DF_DUPLICATE_SP = _mkdf({
+    'shot_point': np.array([1001, 1003, 1003, 1005, 1007], dtype=np.int32)  # Duplicate 1003
+})
+
+_DF_LARGE_GAP = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005, 1025, 1027], dtype=np.int32)  # Large gap between 1005 and 1025
+})
+
+_DF_EMPTY = pd.DataFrame()
+
+_DF_SINGLE_SP = _mkdf({'shot_point': np.array([1001], dtype=np.int32)})
+
+_DF_NO_SHOT_POINT = _mkdf({'other_column': np.array([1, 2, 3], dtype=np.int64)})
+
+_DF_DITHER_NULL = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005], dtype=np.int32),
+    'shot_dither': np.array([0.5, np.nan, 0.3], dtype=np.float32)
+})
+
+_DF_DITHER_ZERO = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005], dtype=np.int32),
+    'shot_dither': np.array([0.5, 0, 0.3], dtype=np.float32)  # Zero is valid
+})
+
+_DF_NO_DITHER = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005], dtype=np.int32)
+})
+
+_DF_FLAGS_NONE = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005], dtype=np.int32),
+    'SP Point QC': _ZEROS_3,
+    'sti_flag': _ZEROS_3,
+    'volume_flag': _ZEROS_3,
+    'gun_depth_flag': _ZEROS_3
+})
+
+_DF_NO_SP_POINT_QC = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005], dtype=np.int32),
+    'sti_flag': np.array([0, 2, 0], dtype=np.int8),
+    'volume_flag': np.array([0, 0, 2], dtype=np.int8)
+})
+
+_DF_ALL_FLAGS = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005, 1007, 1009, 1011], dtype=np.int32),
+    'sti_flag': np.array([0, 0, 2, 0, 0, 0], dtype=np.int8),
+    'sub_array_sep_flag': _ZEROS_6,
+    'cos_sep_flag': _ZEROS_6,
+    'volume_flag': np.array([0, 2, 0, 0, 2, 0], dtype=np.int8),
+    'gun_depth_flag': _ZEROS_6,
+    'gun_pressure_flag': _ZEROS_6,
+    'gun_timing_flag': _ZEROS_6,
+    'repeatability_flag': _ZEROS_6,
+    'sma_flag': _ZEROS_6
+})
+
+_DF_NO_ERRORS = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005], dtype=np.int32),
+    'sti_flag': _ZEROS_3,
+    'volume_flag': _ZEROS_3,
+    'gun_depth_flag': _ZEROS_3,
+    'gun_pressure_flag': _ZEROS_3,
+    'gun_timing_flag': _ZEROS_3,
+    'sub_array_sep_flag': _ZEROS_3,
+    'cos_sep_flag': _ZEROS_3,
+    'repeatability_flag': _ZEROS_3,
+    'sma_flag': _ZEROS_3
+})
+
+_DF_ALL_ERRORS = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005], dtype=np.int32),
+    'sti_flag': np.array([2, 2, 2], dtype=np.int8),
+    'volume_flag': np.array([2, 2, 2], dtype=np.int8),
+    'gun_depth_flag': np.array([2, 2, 2], dtype=np.int8),
+    'gun_pressure_flag': np.array([2, 2, 2], dtype=np.int8),
+    'gun_timing_flag': np.array([2, 2, 2], dtype=np.int8),
+    'sub_array_sep_flag': np.array([2, 2, 2], dtype=np.int8),
+    'cos_sep_flag': np.array([2, 2, 2], dtype=np.int8),
+    'repeatability_flag': np.array([2, 2, 2], dtype=np.int8),
+    'sma_flag': np.array([2, 2, 2], dtype=np.int8)
+})
+
+_DF_MIXED_TYPES = _mkdf({
+    'shot_point': np.array([1001, 1003, 1005], dtype=np.int32),
+    'shot_dither': np.array([0.5, 0.3, 0.4], dtype=np.float32),  # Proper numeric types
+    'sti_flag': np.array([0, 2, 0], dtype=np.int8),  # Proper numeric types
+    'sub_array_sep_flag': _ZEROS_3,
+    'cos_sep_flag': _ZEROS_3,
+    'volume_flag': np.array([0, 0, 2], dtype=np.int8),
+    'gun_depth_flag': _ZEROS_3,
+    'gun_pressure_flag': _ZEROS_3,
+    'gun_timing_flag': _ZEROS_3,
+    'repeatability_flag': _ZEROS_3,
+    'sma_flag': _ZEROS_3
+})
+
+
+@pytest.fixture(scope="module")
 def sample_df_ascending():
-    """Create sample DataFrame with ascending shot points"""
-    return pd.DataFrame({
-        'shot_point': [1001, 1003, 1005, 1007, 1009, 1011],
-        'shot_dither': [0.5, 0.3, 0.4, 0.2, 0.1, 0.3],
-        'sti_flag': [0, 0, 2, 0, 0, 0],
-        'volume_flag': [0, 2, 0, 0, 2, 0],
-        'gun_depth_flag': [0, 0, 0, 0, 0, 0],
-        'SP Point QC': [0, 1, 0, 0, 1, 0]
-    })
-
-
-@pytest.fixture
-def sample_df_descending():
-    """Create sample DataFrame with descending shot points"""
-    return pd.DataFrame({
-        'shot_point': [1011, 1009, 1007, 1005, 1003, 1001],
-        'shot_dither': [0.5, 0.3, 0.4, 0.2, 0.1, 0.3]
-    })
+    """Sample DataFrame with ascending shot points (shared, do not mutate)"""
+    return _DF_ASCENDING
+
+
+# Seeded inputs for the 10 000 shot point frame, drawn once so every flag
+# dtype variant holds the same values
+_LARGE_N = 10000
+_LARGE_DITHER = _RNG.random(_LARGE_N, dtype=np.float32)
+_LARGE_STI = _RNG.integers(0, 2, _LARGE_N, dtype=np.int8) * 2
+_LARGE_VOLUME = _RNG.integers(0, 2, _LARGE_N, dtype=np.int8) * 2
+_LARGE_CLEAN_FLAGS = ('gun_depth_flag', 'gun_pressure_flag', 'gun_timing_flag', 'sub_array_sep_flag',
+                      'cos_sep_flag', 'repeatability_flag', 'sma_flag')
+
+
+@pytest.fixture(scope="module", params=_FLAG_DTYPES)
+def flag_dtype(request):
+    """Flag column dtype under test"""
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def large_qc_df(flag_dtype):
+    """10 000 shot point QC frame (seeded) with flags in flag_dtype, built once per dtype"""
+    cols = {
+        'shot_point': np.arange(1001, 1001 + _LARGE_N, dtype=np.int32),
+        'shot_dither': _LARGE_DITHER,
+        'sti_flag': pd.array(_LARGE_STI, dtype=flag_dtype),
+        'volume_flag': pd.array(_LARGE_VOLUME, dtype=flag_dtype),
+    }
+    for name in _LARGE_CLEAN_FLAGS:
+        cols[name] = pd.array(_zeros(_LARGE_N), dtype=flag_dtype)
+    return _mkdf(cols)
+
+
+@pytest.fixture(scope="module")
+def zero_flag_results(qc_report_generator):
+    """QC outputs for the all-zero flag frames, computed once per module"""
+    return {
+        'log': qc_report_generator.log_shotpoints(_DF_NO_ERRORS),
+        'pct': qc_report_generator.calculate_percentages(_DF_NO_ERRORS, 3),
+        'flags': qc_report_generator.check_flag_discrepancies(_DF_FLAGS_NONE),
+    }
 
 
 class TestDetectSPSorting:
     """Test shot point sorting detection"""
 
-    def test_detect_ascending_sequence_correct(self, qc_report_generator, sample_df_ascending):
-        """Test detection of correct ascending sequence"""
-        issues = qc_report_generator.detect_sp_sorting(sample_df_ascending)
-
-        # Should have no sorting issues
-        assert isinstance(issues, list)
-        # May have gap warnings but no sorting errors
-        sorting_errors = [issue for issue in issues if 'should come before' in issue or 'Duplicate' in issue]
-        assert len(sorting_errors) == 0
-
-    def test_detect_descending_sequence_correct(self, qc_report_generator, sample_df_descending):
-        """Test detection of correct descending sequence"""
-        issues = qc_report_generator.detect_sp_sorting(sample_df_descending)
-
-        sorting_errors = [issue for issue in issues if 'should come after' in issue or 'Duplicate' in issue]
-        assert len(sorting_errors) == 0
-
-    def test_detect_out_of_order_ascending(self, qc_report_generator):
-        """Test detection of out-of-order points in ascending sequence"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005, 1003, 1009]  # 1003 appears twice
-        })
-
-        issues = qc_report_generator.detect_sp_sorting(df)
-
-        assert len(issues) > 0
-        assert any('should come before' in issue or 'appears after' in issue.lower() for issue in issues)
-
-    def test_detect_duplicate_shot_points(self, qc_report_generator):
-        """Test detection of duplicate shot points"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1003, 1005, 1007]  # Duplicate 1003
-        })
-
+    @pytest.mark.parametrize("df,expect_error_substr", [
+        (_DF_ASCENDING, None),
+        (_DF_DESCENDING, None),
+        (_DF_LARGE_GAP, None),  # Gap warning only, no sorting error
+        (_DF_OUT_OF_ORDER, 'appears after'),
+        (_DF_DUPLICATE_SP, 'Duplicate'),
+    ], ids=['asc', 'desc', 'gap', 'out_of_order', 'dup'])
+    def test_detect_sp_sorting(self, qc_report_generator, df, expect_error_substr):
+        """Test sorting errors are reported only for out-of-order or duplicate SPs"""
         issues = qc_report_generator.detect_sp_sorting(df)
 
-        assert len(issues) > 0
-        assert any('Duplicate' in issue for issue in issues)
-
-    def test_detect_large_gap(self, qc_report_generator):
-        """Test detection of large gaps in sequence"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005, 1025, 1027]  # Large gap between 1005 and 1025
-        })
-
-        issues = qc_report_generator.detect_sp_sorting(df)
-
-        # May detect gap warning
         assert isinstance(issues, list)
+        if expect_error_substr is None:
+            assert not any(_SORT_ERR_RE.search(issue) for issue in issues)
+        else:
+            assert any(expect_error_substr in issue for issue in issues)
 
-    def test_detect_empty_dataframe(self, qc_report_generator):
-        """Test handling of empty DataFrame"""
-        df = pd.DataFrame()
-
-        issues = qc_report_generator.detect_sp_sorting(df)
-
-        assert issues == []
-
-    def test_detect_single_shot_point(self, qc_report_generator):
-        """Test handling of DataFrame with single shot point"""
-        df = pd.DataFrame({'shot_point': [1001]})
-
-        issues = qc_report_generator.detect_sp_sorting(df)
-
-        assert issues == []
-
-    def test_detect_missing_shot_point_column(self, qc_report_generator):
-        """Test handling of DataFrame without shot_point column"""
-        df = pd.DataFrame({'other_column': [1, 2, 3]})
-
-        issues = qc_report_generator.detect_sp_sorting(df)
-
-        assert issues == []
+    @pytest.mark.parametrize("df", [
+        _DF_EMPTY,
+        _DF_SINGLE_SP,
+        _DF_NO_SHOT_POINT,
+    ], ids=['empty', 'single', 'missing_col'])
+    def test_detect_sp_sorting_nothing_to_check(self, qc_report_generator, df):
+        """Test that frames with fewer than two shot points yield no issues"""
+        assert qc_report_generator.detect_sp_sorting(df) == []
 
 
 class TestCheckDitherValues:
@@ -148,10 +273,7 @@ class TestCheckDitherValues:
 
     def test_check_dither_with_nulls(self, qc_report_generator):
         """Test detection of null dither values"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005],
-            'shot_dither': [0.5, None, 0.3]
-        })
+        df = _DF_DITHER_NULL
 
         issues, stats = qc_report_generator.check_dither_values(df)
 
@@ -161,10 +283,7 @@ class TestCheckDitherValues:
 
     def test_check_dither_zero_is_valid(self, qc_report_generator):
         """Test that zero (0) is a valid dither value"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005],
-            'shot_dither': [0.5, 0, 0.3]  # Zero is valid
-        })
+        df = _DF_DITHER_ZERO
 
         issues, stats = qc_report_generator.check_dither_values(df)
 
@@ -173,9 +292,7 @@ class TestCheckDitherValues:
 
     def test_check_dither_missing_column(self, qc_report_generator):
         """Test handling of missing shot_dither column"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005]
-        })
+        df = _DF_NO_DITHER
 
         issues, stats = qc_report_generator.check_dither_values(df)
 
@@ -185,7 +302,7 @@ class TestCheckDitherValues:
 
     def test_check_dither_empty_dataframe(self, qc_report_generator):
         """Test handling of empty DataFrame"""
-        df = pd.DataFrame()
+        df = _DF_EMPTY
 
         issues, stats = qc_report_generator.check_dither_values(df)
 
@@ -196,17 +313,9 @@ class TestCheckDitherValues:
 class TestCheckFlagDiscrepancies:
     """Test flag discrepancy detection"""
 
-    def test_check_flag_discrepancies_none(self, qc_report_generator):
+    def test_check_flag_discrepancies_none(self, zero_flag_results):
         """Test with no discrepancies"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005],
-            'SP Point QC': [0, 0, 0],
-            'sti_flag': [0, 0, 0],
-            'volume_flag': [0, 0, 0],
-            'gun_depth_flag': [0, 0, 0]
-        })
-
-        issues = qc_report_generator.check_flag_discrepancies(df)
+        issues = zero_flag_results['flags']
 
         assert isinstance(issues, list)
         assert len(issues) == 0
@@ -220,11 +329,7 @@ class TestCheckFlagDiscrepancies:
 
     def test_check_flag_missing_sp_point_qc(self, qc_report_generator):
         """Test handling of missing SP Point QC column"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005],
-            'sti_flag': [0, 2, 0],
-            'volume_flag': [0, 0, 2]
-        })
+        df = _DF_NO_SP_POINT_QC
 
         issues = qc_report_generator.check_flag_discrepancies(df)
 
@@ -233,7 +338,7 @@ class TestCheckFlagDiscrepancies:
 
     def test_check_flag_empty_dataframe(self, qc_report_generator):
         """Test handling of empty DataFrame"""
-        df = pd.DataFrame()
+        df = _DF_EMPTY
 
         issues = qc_report_generator.check_flag_discrepancies(df)
 
@@ -245,18 +350,7 @@ class TestCalculatePercentages:
 
     def test_calculate_percentages_all_flags(self, qc_report_generator):
         """Test percentage calculation for all QC flags"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005, 1007, 1009, 1011],
-            'sti_flag': [0, 0, 2, 0, 0, 0],
-            'sub_array_sep_flag': [0, 0, 0, 0, 0, 0],
-            'cos_sep_flag': [0, 0, 0, 0, 0, 0],
-            'volume_flag': [0, 2, 0, 0, 2, 0],
-            'gun_depth_flag': [0, 0, 0, 0, 0, 0],
-            'gun_pressure_flag': [0, 0, 0, 0, 0, 0],
-            'gun_timing_flag': [0, 0, 0, 0, 0, 0],
-            'repeatability_flag': [0, 0, 0, 0, 0, 0],
-            'sma_flag': [0, 0, 0, 0, 0, 0]
-        })
+        df = _DF_ALL_FLAGS
         total_sp = len(df)
 
         percentages = qc_report_generator.calculate_percentages(df, total_sp)
@@ -265,22 +359,9 @@ class TestCalculatePercentages:
         # Returns nested dict structure
         assert 'sti_flag' in percentages or 'total' in percentages
 
-    def test_calculate_percentages_no_errors(self, qc_report_generator):
+    def test_calculate_percentages_no_errors(self, zero_flag_results):
         """Test percentage calculation with no errors"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005],
-            'sti_flag': [0, 0, 0],
-            'volume_flag': [0, 0, 0],
-            'gun_depth_flag': [0, 0, 0],
-            'gun_pressure_flag': [0, 0, 0],
-            'gun_timing_flag': [0, 0, 0],
-            'sub_array_sep_flag': [0, 0, 0],
-            'cos_sep_flag': [0, 0, 0],
-            'repeatability_flag': [0, 0, 0],
-            'sma_flag': [0, 0, 0]
-        })
-
-        percentages = qc_report_generator.calculate_percentages(df, 3)
+        percentages = zero_flag_results['pct']
 
         # Should return dict, verify structure
         assert isinstance(percentages, dict)
@@ -288,20 +369,16 @@ class TestCalculatePercentages:
         if 'total' in percentages:
             assert percentages['errors'] == 0.0
 
+    def test_calculate_percentages_flag_dtype(self, qc_report_generator, flag_dtype):
+        """Test that every flag dtype gives the same percentages as int8"""
+        df = _DF_ALL_FLAGS.astype({col: flag_dtype for col in _DF_ALL_FLAGS.columns if col.endswith('_flag')})
+
+        assert qc_report_generator.calculate_percentages(df, 6) == \
+            qc_report_generator.calculate_percentages(_DF_ALL_FLAGS, 6)
+
     def test_calculate_percentages_all_errors(self, qc_report_generator):
         """Test percentage calculation with all errors"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005],
-            'sti_flag': [2, 2, 2],
-            'volume_flag': [2, 2, 2],
-            'gun_depth_flag': [2, 2, 2],
-            'gun_pressure_flag': [2, 2, 2],
-            'gun_timing_flag': [2, 2, 2],
-            'sub_array_sep_flag': [2, 2, 2],
-            'cos_sep_flag': [2, 2, 2],
-            'repeatability_flag': [2, 2, 2],
-            'sma_flag': [2, 2, 2]
-        })
+        df = _DF_ALL_ERRORS
 
         percentages = qc_report_generator.calculate_percentages(df, 3)
 
@@ -313,7 +390,7 @@ class TestCalculatePercentages:
     def test_calculate_percentages_handles_errors(self, qc_report_generator):
         """Test that calculate_percentages handles errors gracefully"""
         # Empty DataFrame should handle gracefully
-        df = pd.DataFrame()
+        df = _DF_EMPTY
 
         try:
             percentages = qc_report_generator.calculate_percentages(df, 0)
@@ -329,18 +406,7 @@ class TestLogShotpoints:
 
     def test_log_shotpoints_with_flags(self, qc_report_generator):
         """Test logging of shot points with flags"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005, 1007, 1009, 1011],
-            'sti_flag': [0, 0, 2, 0, 0, 0],
-            'sub_array_sep_flag': [0, 0, 0, 0, 0, 0],
-            'cos_sep_flag': [0, 0, 0, 0, 0, 0],
-            'volume_flag': [0, 2, 0, 0, 2, 0],
-            'gun_depth_flag': [0, 0, 0, 0, 0, 0],
-            'gun_pressure_flag': [0, 0, 0, 0, 0, 0],
-            'gun_timing_flag': [0, 0, 0, 0, 0, 0],
-            'repeatability_flag': [0, 0, 0, 0, 0, 0],
-            'sma_flag': [0, 0, 0, 0, 0, 0]
-        })
+        df = _DF_ALL_FLAGS
 
         log_data = qc_report_generator.log_shotpoints(df)
 
@@ -351,22 +417,9 @@ class TestLogShotpoints:
         # Verify that flagged shot points are logged
         assert len(log_data['log_volume_flag']) > 0
 
-    def test_log_shotpoints_no_flags(self, qc_report_generator):
+    def test_log_shotpoints_no_flags(self, zero_flag_results):
         """Test logging with no flagged shot points"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005],
-            'sti_flag': [0, 0, 0],
-            'volume_flag': [0, 0, 0],
-            'gun_depth_flag': [0, 0, 0],
-            'gun_pressure_flag': [0, 0, 0],
-            'gun_timing_flag': [0, 0, 0],
-            'sub_array_sep_flag': [0, 0, 0],
-            'cos_sep_flag': [0, 0, 0],
-            'repeatability_flag': [0, 0, 0],
-            'sma_flag': [0, 0, 0]
-        })
-
-        log_data = qc_report_generator.log_shotpoints(df)
+        log_data = zero_flag_results['log']
 
         assert isinstance(log_data, dict)
         # All log lists should be empty
@@ -376,7 +429,7 @@ class TestLogShotpoints:
 
     def test_log_shotpoints_empty_dataframe(self, qc_report_generator):
         """Test handling of empty DataFrame"""
-        df = pd.DataFrame()
+        df = _DF_EMPTY
 
         log_data = qc_report_generator.log_shotpoints(df)
 
@@ -386,23 +439,9 @@ class TestLogShotpoints:
 class TestEdgeCases:
     """Test edge cases and error handling"""
 
-    def test_large_dataset_performance(self, qc_report_generator):
+    def test_large_dataset_performance(self, qc_report_generator, large_qc_df, flag_dtype):
         """Test performance with large dataset"""
-        # Create large DataFrame
-        import numpy as np
-        df = pd.DataFrame({
-            'shot_point': range(1001, 11001),  # 10000 shot points
-            'shot_dither': np.random.rand(10000),
-            'sti_flag': np.random.choice([0, 2], 10000),
-            'volume_flag': np.random.choice([0, 2], 10000),
-            'gun_depth_flag': np.zeros(10000, dtype=int),
-            'gun_pressure_flag': np.zeros(10000, dtype=int),
-            'gun_timing_flag': np.zeros(10000, dtype=int),
-            'sub_array_sep_flag': np.zeros(10000, dtype=int),
-            'cos_sep_flag': np.zeros(10000, dtype=int),
-            'repeatability_flag': np.zeros(10000, dtype=int),
-            'sma_flag': np.zeros(10000, dtype=int)
-        })
+        df = large_qc_df
 
         # Should complete without errors
         issues = qc_report_generator.detect_sp_sorting(df)
@@ -412,24 +451,21 @@ class TestEdgeCases:
         assert isinstance(dither_issues, list)
         assert isinstance(dither_stats, dict)
 
-        percentages = qc_report_generator.calculate_percentages(df, 10000)
+        percentages = qc_report_generator.calculate_percentages(df, _LARGE_N)
         assert isinstance(percentages, dict)
+        assert percentages['sti_flag']['error_count'] == np.count_nonzero(_LARGE_STI)
+        assert percentages['volume_flag']['error_count'] == np.count_nonzero(_LARGE_VOLUME)
+        for name in _LARGE_CLEAN_FLAGS:
+            assert percentages[name]['total_count'] == 0
+
+        # The QC passes must not upcast the shared int32 shot point column or the flags
+        assert df['shot_point'].dtype == np.int32
+        flag_cols = [col for col in df.columns if col.endswith('_flag')]
+        assert (df[flag_cols].dtypes == pd.api.types.pandas_dtype(flag_dtype)).all()
 
     def test_mixed_data_types(self, qc_report_generator):
         """Test handling of mixed data types"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005],
-            'shot_dither': [0.5, 0.3, 0.4],  # Proper numeric types
-            'sti_flag': [0, 2, 0],  # Proper numeric types
-            'sub_array_sep_flag': [0, 0, 0],
-            'cos_sep_flag': [0, 0, 0],
-            'volume_flag': [0, 0, 2],
-            'gun_depth_flag': [0, 0, 0],
-            'gun_pressure_flag': [0, 0, 0],
-            'gun_timing_flag': [0, 0, 0],
-            'repeatability_flag': [0, 0, 0],
-            'sma_flag': [0, 0, 0]
-        })
+        df = _DF_MIXED_TYPES
 
         # Should handle without crashing
         issues, stats = qc_report_generator.check_dither_values(df)
@@ -439,6 +475,13 @@ class TestEdgeCases:
         percentages = qc_report_generator.calculate_percentages(df, 3)
         assert isinstance(percentages, dict)
 
+    def test_generator_leaves_shared_flag_buffer_untouched(self, zero_flag_results):
+        """Test that the QC outputs leave the zero buffer shared by the clean frames at zero"""
+        # zero_flag_results has already run log_shotpoints, calculate_percentages
+        # and check_flag_discrepancies on frames whose flag columns all alias _ZEROS_3
+        assert all(len(v) == 0 for k, v in zero_flag_results['log'].items() if k.startswith('log_'))
+        assert not _ZEROS_3.any()
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -11,7 +11,14 @@ from qc_validator import QCValidator, QCThresholds
 from config_manager import ConfigManager
 
 
-@pytest.fixture
+# Keep this file on one xdist worker under --dist loadgroup so the
+# session-scoped validator below is built once rather than per worker
+pytestmark = pytest.mark.xdist_group(name="qc_validator")
+
+
+# None of the tests change the validator or its thresholds, so one
+# instance (and one config load) serves the whole session
+@pytest.fixture(scope="session")
 def qc_validator(config_file):
     """Create QCValidator instance with test config"""
     config = ConfigManager(config_file)
@@ -19,25 +26,115 @@ def qc_validator(config_file):
     return QCValidator(config)
 
 
+# Sample frame built once at import, in the narrowest dtypes that hold the
+# values; the fixture hands each test its own copy
+_SAMPLE_TEMPLATE = pd.DataFrame({
+    'shot_point': [1001, 1003, 1005, 1007, 1009],
+    'Shot Time (s)  sec': [6.175, 5.5, 6.3, 10.5, 5.0],
+    'VOLUME': [3040, 3040, 2900, 3040, 3040],
+    'Radial (m)': [2.0, 11.0, 3.0, 2.5, -12.0],
+    'Gunarray301-Gunarray302 Position m': [37.5, 32.0, 38.0, 43.0, 37.5],
+    'SOURCE SSTG1 towed by SST String 1 - 2 Crossline Separation All Shots ': [8.0, 6.0, 8.5, 10.0, 7.5],
+    'SSTGM1D1_DPT (P) Shot Event m': [-7.0, -7.2, -8.5, -7.1, -5.5],
+    'SSTGM1D2_DPT (P) Shot Event m': [-7.1, -7.0, -8.3, -7.2, -5.8],
+    'SSTGM1P1_PRS (P) Shot Event  ': [2000, 1850, 2050, 2000, 2200],
+    'SSTGM1P2_PRS (P) Shot Event  ': [2010, 1880, 2040, 2010, 2180],
+    'String_1-Cluster_1-Gun_1': [0.5, 0.8, 1.2, 2.0, 0.3],
+    'String_1-Cluster_1-Gun_2': [0.3, 90, 0.9, 1.8, 61],
+    'Gunarray301 SMA m': [1.5, 2.0, 3.5, 1.8, 2.2],
+    'point_code': ['A1', 'A1', 'A1', 'A1', 'A1']
+}).astype({
+    'shot_point': 'int32',
+    'Shot Time (s)  sec': 'float32',
+    'VOLUME': 'int32',
+    'Radial (m)': 'float32',
+    'Gunarray301-Gunarray302 Position m': 'float32',
+    'SOURCE SSTG1 towed by SST String 1 - 2 Crossline Separation All Shots ': 'float32',
+    'SSTGM1D1_DPT (P) Shot Event m': 'float32',
+    'SSTGM1D2_DPT (P) Shot Event m': 'float32',
+    'SSTGM1P1_PRS (P) Shot Event  ': 'int32',
+    'SSTGM1P2_PRS (P) Shot Event  ': 'int32',
+    'String_1-Cluster_1-Gun_1': 'float32',
+    'String_1-Cluster_1-Gun_2': 'float32',
+    'Gunarray301 SMA m': 'float32',
+    'point_code': 'category',
+})
+_ORIGINAL_COLS = frozenset(_SAMPLE_TEMPLATE.columns)
+
+
+@pytest.fixture
+def sample_df(copy_on_write):
+    """Sample DataFrame for one test; a lazy copy when Copy-on-Write is on"""
+    return _SAMPLE_TEMPLATE.copy(deep=not copy_on_write)
+
+
+# Shot points each validator flags in the sample frame
+_STI_FLAGGED = frozenset({1003, 1009})
+_SUB_ARRAY_FLAGGED = frozenset({1003, 1007})
+_COS_FLAGGED = frozenset({1003, 1007})
+_VOLUME_FLAGGED = frozenset({1005})
+_GUN_DEPTH_FLAGGED = frozenset({1005, 1009})
+_RADIAL_FLAGGED = frozenset({1003, 1009})
+_SMA_FLAGGED = frozenset({1005})
+
+
+def _expected_flags(flagged, level=2):
+    """int8 flag array over the sample shot points, level at the flagged ones"""
+    sp = _SAMPLE_TEMPLATE['shot_point'].to_numpy()
+    return np.where(np.isin(sp, list(flagged)), level, 0).astype(np.int8)
+
+
+# Expected per-SP flags for the sample frame (SP 1001..1009); the individual
+# validators leave unflagged rows NaN, so results are compared via _flag_values.
+# Whole-array equality also catches shot points flagged beyond the sets above
+_NO_FLAGS = np.zeros(5, dtype=np.int8)
+_EXPECTED_STI = _expected_flags(_STI_FLAGGED)
+_EXPECTED_SUB_ARRAY = _expected_flags(_SUB_ARRAY_FLAGGED)
+_EXPECTED_COS = _expected_flags(_COS_FLAGGED)
+_EXPECTED_VOLUME = _expected_flags(_VOLUME_FLAGGED)
+_EXPECTED_GUN_DEPTH = _expected_flags(_GUN_DEPTH_FLAGGED)
+_EXPECTED_RADIAL = _expected_flags(_RADIAL_FLAGGED, level=1)
+_EXPECTED_SMA = _expected_flags(_SMA_FLAGGED)
+
+
+def _flag_values(result, flag):
+    """Flag column as int8, unflagged (NaN) rows as 0"""
+    return result[flag].fillna(0).to_numpy(dtype=np.int8)
+
+
+# Flag columns checked by the consecutive-error and source-error-window scans
+FLAG_COLS = (
+    'volume_flag', 'gun_depth_flag', 'gun_pressure_flag', 'gun_timing_flag',
+    'sub_array_sep_flag', 'cos_sep_flag', 'repeatability_flag', 'sma_flag',
+)
+
+# Every flag column validate_data adds
+_EXPECTED_FLAG_COLS = frozenset({'sti_flag', *FLAG_COLS})
+
+
+def _make_flag_df(n, volume_errors=slice(0)):
+    """n shot points from 1001 with int8 flags, volume_flag = 2 at volume_errors"""
+    flags = {name: np.zeros(n, dtype=np.int8) for name in FLAG_COLS}
+    flags['volume_flag'][volume_errors] = 2
+    return pd.DataFrame({'shot_point': np.arange(1001, 1001 + n, dtype=np.int32), **flags})
+
+
 @pytest.fixture
-def sample_df():
-    """Create sample DataFrame for testing"""
-    return pd.DataFrame({
-        'shot_point': [1001, 1003, 1005, 1007, 1009],
-        'Shot Time (s)  sec': [6.175, 5.5, 6.3, 10.5, 5.0],
-        'VOLUME': [3040, 3040, 2900, 3040, 3040],
-        'Radial (m)': [2.0, 11.0, 3.0, 2.5, -12.0],
-        'Gunarray301-Gunarray302 Position m': [37.5, 32.0, 38.0, 43.0, 37.5],
-        'SOURCE SSTG1 towed by SST String 1 - 2 Crossline Separation All Shots ': [8.0, 6.0, 8.5, 10.0, 7.5],
-        'SSTGM1D1_DPT (P) Shot Event m': [-7.0, -7.2, -8.5, -7.1, -5.5],
-        'SSTGM1D2_DPT (P) Shot Event m': [-7.1, -7.0, -8.3, -7.2, -5.8],
-        'SSTGM1P1_PRS (P) Shot Event  ': [2000, 1850, 2050, 2000, 2200],
-        'SSTGM1P2_PRS (P) Shot Event  ': [2010, 1880, 2040, 2010, 2180],
-        'String_1-Cluster_1-Gun_1': [0.5, 0.8, 1.2, 2.0, 0.3],
-        'String_1-Cluster_1-Gun_2': [0.3, 90, 0.9, 1.8, 61],
-        'Gunarray301 SMA m': [1.5, 2.0, 3.5, 1.8, 2.2],
-        'point_code': ['A1', 'A1', 'A1', 'A1', 'A1']
-    })
+def make_timing_df():
+    """Factory for small gun timing frames: shot points 1001, 1003, ... with zeroed flags"""
+    def _make(g1, g2=None):
+        n = len(g1)
+        data = {
+            'shot_point': np.arange(1001, 1001 + 2 * n, 2, dtype=np.int32),
+            'String_1-Cluster_1-Gun_1': np.asarray(g1, dtype=np.float32),
+        }
+        if g2 is not None:
+            data['String_1-Cluster_1-Gun_2'] = np.asarray(g2, dtype=np.float32)
+        # generate_line_log_report reads sti_flag too, so zero it with the rest
+        for name in ('sti_flag',) + FLAG_COLS:
+            data[name] = np.zeros(n, dtype=np.int8)
+        return pd.DataFrame(data, copy=False)
+    return _make
 
 
 class TestQCThresholds:
@@ -63,21 +160,19 @@ class TestQCThresholds:
 class TestSTIValidation:
     """Test Shot Time Interval validation"""
 
-    def test_sti_error_flag(self, qc_validator, sample_df):
+    @pytest.mark.parametrize("col_values,expected", [
+        # SP 1003 (5.5s) and SP 1009 (5.0s) are < 6.0s
+        (None, _EXPECTED_STI),
+        ([6.5, 7.0, 6.8, 10.0, 6.2], _NO_FLAGS),
+    ], ids=['violations', 'ok'])
+    def test_sti_error_flag(self, qc_validator, sample_df, col_values, expected):
         """Test STI error flagging (< 6.0s)"""
-        result = qc_validator.validate_sti(sample_df.copy())
-
-        assert 'sti_flag' in result.columns
-        # SP 1009 has STI = 5.0 (< 6.0, should be flagged)
-        assert result.loc[result['shot_point'] == 1009, 'sti_flag'].iloc[0] == 2
-
-    def test_sti_no_error(self, qc_validator, sample_df):
-        """Test STI with no errors"""
-        # Set all STI values > 6.0
-        sample_df['Shot Time (s)  sec'] = [6.5, 7.0, 6.8, 10.0, 6.2]
+        if col_values is not None:
+            sample_df['Shot Time (s)  sec'] = col_values
         result = qc_validator.validate_sti(sample_df)
 
-        assert result['sti_flag'].sum() == 0
+        assert 'sti_flag' in result.columns
+        np.testing.assert_array_equal(_flag_values(result, 'sti_flag'), expected)
 
     def test_sti_missing_column(self, qc_validator):
         """Test handling of missing STI column"""
@@ -91,43 +186,37 @@ class TestSTIValidation:
 class TestSubArraySeparation:
     """Test sub-array separation validation"""
 
-    def test_sub_array_separation_violations(self, qc_validator, sample_df):
-        """Test sub-array separation flagging"""
-        result = qc_validator.validate_sub_array_separation(sample_df.copy())
-
-        assert 'sub_array_sep_flag' in result.columns
+    @pytest.mark.parametrize("col_values,expected", [
         # SP 1003 has 6.0m (< 6.8m min), SP 1007 has 10.0m (> 9.2m max)
-        flagged = result[result['sub_array_sep_flag'] == 2]
-        assert len(flagged) == 2
-        assert 1003 in flagged['shot_point'].values
-        assert 1007 in flagged['shot_point'].values
-
-    def test_sub_array_separation_ok(self, qc_validator, sample_df):
-        """Test sub-array separation with all values in range"""
-        sample_df['SOURCE SSTG1 towed by SST String 1 - 2 Crossline Separation All Shots '] = [7.5, 8.0, 7.8, 8.2, 7.9]
+        (None, _EXPECTED_SUB_ARRAY),
+        ([7.5, 8.0, 7.8, 8.2, 7.9], _NO_FLAGS),
+    ], ids=['violations', 'ok'])
+    def test_sub_array_separation(self, qc_validator, sample_df, col_values, expected):
+        """Test sub-array separation flagging"""
+        if col_values is not None:
+            sample_df['SOURCE SSTG1 towed by SST String 1 - 2 Crossline Separation All Shots '] = col_values
         result = qc_validator.validate_sub_array_separation(sample_df)
 
-        assert result['sub_array_sep_flag'].sum() == 0
+        assert 'sub_array_sep_flag' in result.columns
+        np.testing.assert_array_equal(_flag_values(result, 'sub_array_sep_flag'), expected)
 
 
 class TestCOSSeparation:
     """Test Center of Source (COS) separation validation"""
 
-    def test_cos_dual_source_violations(self, qc_validator, sample_df):
-        """Test COS dual source flagging"""
-        result = qc_validator.validate_cos_separation(sample_df.copy())
-
-        assert 'cos_sep_flag' in result.columns
+    @pytest.mark.parametrize("col_values,expected", [
         # SP 1003 has 32.0 (< 33.75 min), SP 1007 has 43.0 (> 41.25 max)
-        flagged = result[result['cos_sep_flag'] == 2]
-        assert len(flagged) == 2
-
-    def test_cos_dual_source_ok(self, qc_validator, sample_df):
-        """Test COS with all values in range"""
-        sample_df['Gunarray301-Gunarray302 Position m'] = [37.5, 38.0, 37.8, 38.5, 37.2]
+        (None, _EXPECTED_COS),
+        ([37.5, 38.0, 37.8, 38.5, 37.2], _NO_FLAGS),
+    ], ids=['violations', 'ok'])
+    def test_cos_dual_source(self, qc_validator, sample_df, col_values, expected):
+        """Test COS dual source flagging"""
+        if col_values is not None:
+            sample_df['Gunarray301-Gunarray302 Position m'] = col_values
         result = qc_validator.validate_cos_separation(sample_df)
 
-        assert result['cos_sep_flag'].sum() == 0
+        assert 'cos_sep_flag' in result.columns
+        np.testing.assert_array_equal(_flag_values(result, 'cos_sep_flag'), expected)
 
 
 class TestVolumeValidation:
@@ -135,12 +224,11 @@ class TestVolumeValidation:
 
     def test_volume_violations(self, qc_validator, sample_df):
         """Test volume flagging (excluding misfires)"""
-        result = qc_validator.validate_volume(sample_df.copy())
+        result = qc_validator.validate_volume(sample_df)
 
         assert 'volume_flag' in result.columns
         # SP 1005 has volume 2900 (not 3040), and no misfire
-        flagged = result[result['volume_flag'] == 2]
-        assert 1005 in flagged['shot_point'].values
+        np.testing.assert_array_equal(_flag_values(result, 'volume_flag'), _EXPECTED_VOLUME)
 
     def test_volume_misfire_excluded(self, qc_validator):
         """Test that SP with misfires are not flagged for volume"""
@@ -160,15 +248,14 @@ class TestGunDepthValidation:
 
     def test_gun_depth_violations(self, qc_validator, sample_df):
         """Test gun depth flagging"""
-        result = qc_validator.validate_gun_depth(sample_df.copy())
+        result = qc_validator.validate_gun_depth(sample_df)
 
         assert 'gun_depth_flag' in result.columns
         assert 'average_gun_depth' in result.columns
 
         # SP 1005 has avg depth ~-8.4m (< -8.0 min)
         # SP 1009 has avg depth ~-5.65m (> -6.0 max)
-        flagged = result[result['gun_depth_flag'] == 2]
-        assert len(flagged) == 2
+        np.testing.assert_array_equal(_flag_values(result, 'gun_depth_flag'), _EXPECTED_GUN_DEPTH)
 
     def test_gun_depth_sensors_validation(self, qc_validator, sample_df):
         """Test individual gun depth sensor validation"""
@@ -183,7 +270,7 @@ class TestGunPressureValidation:
 
     def test_gun_pressure_violations(self, qc_validator, sample_df):
         """Test gun pressure flagging by point_code"""
-        result = qc_validator.validate_gun_pressure(sample_df.copy())
+        result = qc_validator.validate_gun_pressure(sample_df)
 
         assert 'gun_pressure_flag' in result.columns
         # SP 1003 has P1=1850 (< 1900 min)
@@ -208,7 +295,7 @@ class TestGunTimingValidation:
 
     def test_gun_timing_warnings_and_errors(self, qc_validator, sample_df):
         """Test gun timing flagging (warnings and errors)"""
-        df = sample_df.copy()
+        df = sample_df
         df['gun_timing_flag'] = 0  # Initialize flag column
         result = qc_validator.validate_gun_timing(df)
 
@@ -220,13 +307,9 @@ class TestGunTimingValidation:
         assert warnings >= 1
         assert errors >= 1
 
-    def test_gun_timing_excludes_special_codes(self, qc_validator):
+    def test_gun_timing_excludes_special_codes(self, qc_validator, make_timing_df):
         """Test that special codes (63, 61, 90) don't set timing flags"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005, 1007],
-            'String_1-Cluster_1-Gun_1': [63, 61, 90, 0.5],
-            'gun_timing_flag': [0, 0, 0, 0]
-        })
+        df = make_timing_df([63, 61, 90, 0.5])
         result = qc_validator.validate_gun_timing(df)
 
         # Only last SP should have timing flag (0.5ms is OK)
@@ -238,12 +321,11 @@ class TestRadialValidation:
 
     def test_radial_violations(self, qc_validator, sample_df):
         """Test radial flagging"""
-        result = qc_validator.validate_radial(sample_df.copy())
+        result = qc_validator.validate_radial(sample_df)
 
         assert 'repeatability_flag' in result.columns
         # SP 1003 has 11.0m (> 10m limit), SP 1009 has -12.0m (< -10m limit)
-        flagged = result[result['repeatability_flag'] == 1]
-        assert len(flagged) == 2
+        np.testing.assert_array_equal(_flag_values(result, 'repeatability_flag'), _EXPECTED_RADIAL)
 
 
 class TestSMAValidation:
@@ -251,13 +333,11 @@ class TestSMAValidation:
 
     def test_sma_violations(self, qc_validator, sample_df):
         """Test SMA flagging"""
-        result = qc_validator.validate_sma(sample_df.copy())
+        result = qc_validator.validate_sma(sample_df)
 
         assert 'sma_flag' in result.columns
         # SP 1005 has SMA 3.5m (> 3.0m limit)
-        flagged = result[result['sma_flag'] == 2]
-        assert len(flagged) == 1
-        assert 1005 in flagged['shot_point'].values
+        np.testing.assert_array_equal(_flag_values(result, 'sma_flag'), _EXPECTED_SMA)
 
 
 class TestValidateData:
@@ -265,32 +345,20 @@ class TestValidateData:
 
     def test_validate_data_complete(self, qc_validator, sample_df):
         """Test that validate_data runs all checks"""
-        result = qc_validator.validate_data(sample_df.copy())
+        result = qc_validator.validate_data(sample_df)
 
         # Check that all flag columns are created
-        expected_flags = [
-            'sti_flag',
-            'sub_array_sep_flag',
-            'cos_sep_flag',
-            'volume_flag',
-            'gun_depth_flag',
-            'gun_pressure_flag',
-            'gun_timing_flag',
-            'repeatability_flag',
-            'sma_flag'
-        ]
-
-        for flag in expected_flags:
-            assert flag in result.columns
-            assert result[flag].dtype in [int, 'Int64']
+        missing = _EXPECTED_FLAG_COLS - set(result.columns)
+        assert not missing, f"Missing flag columns: {sorted(missing)}"
+
+        dtypes = result[sorted(_EXPECTED_FLAG_COLS)].dtypes
+        assert dtypes.isin([np.dtype('int64'), pd.Int64Dtype()]).all(), dtypes.to_dict()
 
     def test_validate_data_preserves_columns(self, qc_validator, sample_df):
         """Test that original columns are preserved"""
-        original_cols = sample_df.columns.tolist()
-        result = qc_validator.validate_data(sample_df.copy())
+        result = qc_validator.validate_data(sample_df)
 
-        for col in original_cols:
-            assert col in result.columns
+        assert _ORIGINAL_COLS.issubset(result.columns)
 
 
 class TestConsecutiveErrors:
@@ -298,17 +366,7 @@ class TestConsecutiveErrors:
 
     def test_check_consecutive_errors(self, qc_validator):
         """Test consecutive error detection"""
-        df = pd.DataFrame({
-            'shot_point': list(range(1001, 1051)),  # 50 shot points
-            'volume_flag': [2] * 30 + [0] * 20,  # 30 consecutive volume errors
-            'gun_depth_flag': [0] * 50,
-            'gun_pressure_flag': [0] * 50,
-            'gun_timing_flag': [0] * 50,
-            'sub_array_sep_flag': [0] * 50,
-            'cos_sep_flag': [0] * 50,
-            'repeatability_flag': [0] * 50,
-            'sma_flag': [0] * 50,
-        })
+        df = _make_flag_df(50, slice(0, 30))  # 30 consecutive volume errors
 
         consecutive_errors = qc_validator.check_consecutive_errors(df)
 
@@ -318,47 +376,32 @@ class TestConsecutiveErrors:
 
     def test_check_consecutive_errors_no_violations(self, qc_validator):
         """Test consecutive error detection with no violations"""
-        df = pd.DataFrame({
-            'shot_point': list(range(1001, 1021)),  # 20 shot points
-            'volume_flag': [0] * 20,
-            'gun_depth_flag': [0] * 20,
-            'gun_pressure_flag': [0] * 20,
-            'gun_timing_flag': [0] * 20,
-            'sub_array_sep_flag': [0] * 20,
-            'cos_sep_flag': [0] * 20,
-            'repeatability_flag': [0] * 20,
-            'sma_flag': [0] * 20,
-        })
+        df = _make_flag_df(20)
 
         consecutive_errors = qc_validator.check_consecutive_errors(df)
         assert len(consecutive_errors) == 0
 
 
+# Read-only shot point arrays shared by the missing shot point tests
+_SP_GAPPED = np.array([1001, 1003, 1005, 1009, 1011], dtype=np.int32)
+_SP_1001_1005 = np.arange(1001, 1006, dtype=np.int32)
+
+
 class TestMissingShotPoints:
     """Test missing shot point detection"""
 
     def test_check_missing_shot_points(self, qc_validator):
         """Test missing shot point detection"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005, 1009, 1011]  # Missing 1007
-        })
+        df = pd.DataFrame({'shot_point': _SP_GAPPED}, copy=False)  # Missing 1007
 
         missed_sp = qc_validator.check_missing_shot_points(df)
 
-        # Should detect missing shot points
-        assert len(missed_sp) > 0
-        assert 1002 in missed_sp  # 1001 -> 1003 (missing 1002)
-        assert 1004 in missed_sp  # 1003 -> 1005 (missing 1004)
-        assert 1006 in missed_sp  # 1005 -> 1009 (missing 1006, 1007, 1008)
-        assert 1007 in missed_sp
-        assert 1008 in missed_sp
-        assert 1010 in missed_sp  # 1009 -> 1011 (missing 1010)
+        # 1001 -> 1003 (1002), 1003 -> 1005 (1004), 1005 -> 1009 (1006-1008), 1009 -> 1011 (1010)
+        assert {1002, 1004, 1006, 1007, 1008, 1010}.issubset(set(missed_sp))
 
     def test_check_missing_shot_points_none(self, qc_validator):
         """Test with no missing shot points"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1002, 1003, 1004, 1005]  # Consecutive sequence (gap of 1)
-        })
+        df = pd.DataFrame({'shot_point': _SP_1001_1005}, copy=False)  # Consecutive sequence (gap of 1)
 
         missed_sp = qc_validator.check_missing_shot_points(df)
         assert len(missed_sp) == 0
@@ -369,14 +412,7 @@ class TestSourceErrorWindows:
 
     def test_check_source_error_windows_7_consecutive(self, qc_validator):
         """Test detection of 7 consecutive source errors"""
-        df = pd.DataFrame({
-            'shot_point': list(range(1001, 1021)),
-            'volume_flag': [2] * 8 + [0] * 12,  # 8 consecutive errors
-            'gun_depth_flag': [0] * 20,
-            'gun_pressure_flag': [0] * 20,
-            'gun_timing_flag': [0] * 20,
-            'sma_flag': [0] * 20,
-        })
+        df = _make_flag_df(20, slice(0, 8))  # 8 consecutive errors
 
         results = qc_validator.check_source_error_windows(df)
 
@@ -385,16 +421,8 @@ class TestSourceErrorWindows:
 
     def test_check_source_error_windows_12_of_24(self, qc_validator):
         """Test detection of 12 errors in 24 SP window"""
-        # Create pattern: 12 errors scattered in first 24 SP
-        flags = [2, 0, 2, 0, 2, 0, 2, 0, 2, 0, 2, 0, 2, 0, 2, 0, 2, 0, 2, 0, 2, 0, 2, 0] + [0] * 16
-        df = pd.DataFrame({
-            'shot_point': list(range(1001, 1041)),
-            'volume_flag': flags,
-            'gun_depth_flag': [0] * 40,
-            'gun_pressure_flag': [0] * 40,
-            'gun_timing_flag': [0] * 40,
-            'sma_flag': [0] * 40,
-        })
+        # 12 errors on every other SP of the first 24
+        df = _make_flag_df(40, slice(0, 24, 2))
 
         results = qc_validator.check_source_error_windows(df)
 
@@ -402,14 +430,7 @@ class TestSourceErrorWindows:
 
     def test_check_source_error_windows_percent_3(self, qc_validator):
         """Test detection of >3% total source errors"""
-        df = pd.DataFrame({
-            'shot_point': list(range(1001, 1101)),  # 100 SP
-            'volume_flag': [2] * 5 + [0] * 95,  # 5% errors (> 3% threshold)
-            'gun_depth_flag': [0] * 100,
-            'gun_pressure_flag': [0] * 100,
-            'gun_timing_flag': [0] * 100,
-            'sma_flag': [0] * 100,
-        })
+        df = _make_flag_df(100, slice(0, 5))  # 5% errors (> 3% threshold)
 
         results = qc_validator.check_source_error_windows(df)
 
@@ -420,9 +441,23 @@ class TestLineLogReport:
     """Test line log report generation"""
 
     def test_generate_line_log_report(self, qc_validator, sample_df):
-        """Test line log report generation"""
+        """Test line log report generation from preset flags"""
+        flags = {name: np.zeros(len(sample_df), dtype=np.int8) for name in sorted(_EXPECTED_FLAG_COLS)}
+        flags['volume_flag'][2] = 2  # SP 1005
+        flags['gun_depth_flag'][2::2] = 2  # SP 1005, 1009
+        validated_df = sample_df.assign(**flags)
+
+        log_data = qc_validator.generate_line_log_report(validated_df, {}, [])
+
+        np.testing.assert_array_equal(log_data['log_volume_flag'], [1005])
+        np.testing.assert_array_equal(log_data['log_gun_depth_flag'], [1005, 1009])
+        assert len(log_data['log_sma_flag']) == 0
+
+    @pytest.mark.integration
+    def test_generate_line_log_report_after_validate_data(self, qc_validator, sample_df):
+        """Test line log report generation on validate_data output"""
         # Run validation first
-        validated_df = qc_validator.validate_data(sample_df.copy())
+        validated_df = qc_validator.validate_data(sample_df)
 
         percentages = {
             'sti_percent': 5.0,
@@ -440,33 +475,39 @@ class TestLineLogReport:
         # Check that flagged shot points are logged
         assert len(log_data['log_volume_flag']) > 0
 
-    def test_generate_line_log_report_with_timing(self, qc_validator):
+    def test_generate_line_log_report_with_timing(self, qc_validator, make_timing_df):
         """Test line log report with timing warnings/errors"""
-        df = pd.DataFrame({
-            'shot_point': [1001, 1003, 1005],
-            'String_1-Cluster_1-Gun_1': [1.2, 2.0, 0.5],  # Warning, error, OK
-            'String_1-Cluster_1-Gun_2': [0.3, 0.5, 0.4],
-        })
-
-        # Initialize flags
-        df['sti_flag'] = 0
-        df['sub_array_sep_flag'] = 0
-        df['cos_sep_flag'] = 0
-        df['volume_flag'] = 0
-        df['gun_depth_flag'] = 0
-        df['gun_pressure_flag'] = 0
-        df['gun_timing_flag'] = 0
-        df['repeatability_flag'] = 0
-        df['sma_flag'] = 0
+        # Gun_1: warning, error, OK
+        df = make_timing_df([1.2, 2.0, 0.5], g2=[0.3, 0.5, 0.4])
 
         # Run timing validation
-        validated_df = qc_validator.validate_gun_timing(df.copy())
+        validated_df = qc_validator.validate_gun_timing(df)
 
         log_data = qc_validator.generate_line_log_report(validated_df, {}, [])
 
         # Should have timing warning and/or error logs
         assert 'log_timing_warning' in log_data or 'log_timing_error' in log_data
 
+    @pytest.mark.parametrize("shot_points", [
+        pd.array([1001, None, 1005], dtype='Int64'),
+        np.array([1001.0, np.nan, 1005.0]),
+    ], ids=['Int64_NA', 'float_NaN'])
+    def test_generate_line_log_report_missing_shot_point(self, qc_validator, shot_points):
+        """Test that flagged rows without a shot point are left out of the int32 logs"""
+        df = pd.DataFrame({
+            'shot_point': shot_points,
+            'Raw: SST_GUN1 #Autofires': [1, 1, 0],
+        })
+        for flag in ('sti_flag', 'sub_array_sep_flag', 'cos_sep_flag', 'volume_flag', 'gun_depth_flag',
+                     'gun_pressure_flag', 'gun_timing_flag', 'repeatability_flag', 'sma_flag'):
+            df[flag] = 0
+        df['volume_flag'] = [2, 2, 0]
+
+        log_data = qc_validator.generate_line_log_report(df, {}, [])
+
+        np.testing.assert_array_equal(log_data['log_volume_flag'], np.array([1001], dtype=np.int32))
+        np.testing.assert_array_equal(log_data['log_autofires'], np.array([1001], dtype=np.int32))
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])